@@ -5,44 +5,288 @@ A lightweight monitoring agent that sends data to the management server
 """
 
 import os
-import json
+import codecs
+import functools
+import gzip
 import time
 import platform
-import subprocess
+import queue
+import re
+import shutil
 import socket
+import threading
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from itertools import islice
 from pathlib import Path
-import requests
-import psutil
 import argparse
 import sys
 
-# Simple logging
+# orjson is much faster for the large project/docker payloads; fall back to
+# the stdlib encoder when it isn't installed
+try:
+    import orjson
+    json_dumps = orjson.dumps
+    json_loads = orjson.loads
+except ImportError:
+    import json
+    
+    def json_dumps(obj):
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+    
+    json_loads = json.loads
+
+# requests and psutil are slow to import, so they are loaded on first use
+# (see _load_requests / _load_psutil); the interactive prompts don't pay for them
+requests = None
+psutil = None
+
+# Stop looking for repositories after this many (limit for POC)
+MAX_PROJECTS = 20
+
+# Folders under the scan root that usually hold projects; walked first
+PRIORITY_DIRS = frozenset({
+    'projects', 'code', 'src', 'dev', 'work', 'repos', 'github', 'gitlab'
+})
+
+# Directories that never contain repositories worth reporting
+SKIP_DIRS = frozenset({
+    'node_modules', '.venv', 'venv', '__pycache__', '.git',
+    'target', 'dist', 'build', '.cache'
+})
+
+GIB = 1024 ** 3
+
+# Payload timestamps (UTC)
+ISO_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+# Payloads are pre-encoded to bytes, so the content type is set by hand
+JSON_HEADERS = {'Content-Type': 'application/json'}
+GZIP_JSON_HEADERS = {**JSON_HEADERS, 'Content-Encoding': 'gzip'}
+
+# Payloads larger than this (bytes) are sent gzip-compressed
+GZIP_MIN_BYTES = 1024
+
+# (connect, read) timeouts for calls to the management server
+HTTP_TIMEOUT = (3, 10)
+
+# Finished cycles waiting for the background sender (continuous mode)
+SEND_QUEUE_SIZE = 16
+USER_AGENT = 'devops-agent/1.0'
+
+# Shortest window (seconds) a non-blocking CPU sample is taken over
+CPU_MIN_SAMPLE_WINDOW = 0.1
+
+# Project scan limits (for performance)
+MAX_SCAN_BYTES = 500 * 1024 * 1024
+MAX_SCAN_FILES = 10000
+MAX_SCAN_DEPTH = 6
+
+# Extensions and file names (lowercase) that identify a project type
+EXT_TO_TYPES = {
+    '.py': ['python'],
+    '.js': ['javascript'],
+    '.ts': ['javascript'],
+    '.java': ['java'],
+    '.go': ['go'],
+    '.rs': ['rust']
+}
+NAME_TO_TYPES = {
+    'requirements.txt': ['python'],
+    'setup.py': ['python'],
+    'pyproject.toml': ['python'],
+    'package.json': ['javascript'],
+    'pom.xml': ['java'],
+    'build.gradle': ['java'],
+    'go.mod': ['go'],
+    'cargo.toml': ['rust'],
+    'dockerfile': ['docker'],
+    'docker-compose.yml': ['docker']
+}
+
+# Top-level file names worth remembering while scanning a project
+MARKER_FILES = frozenset(NAME_TO_TYPES)
+
+# Package name at the start of a requirements line; comment and pip option
+# lines (#, -r, -e) don't start with a name character and never match
+_REQ_NAME = re.compile(rb'^[ \t]*([A-Za-z0-9][A-Za-z0-9._-]*)', re.MULTILINE)
+
+# Dependency manifests are read up to this many bytes
+MAX_MANIFEST_BYTES = 1024 * 1024
+
+# Top-level names that indicate a virtual environment
+VENV_NAMES = frozenset({'.venv', 'venv', '.env', 'env'})
+
+
+@dataclass
+class ProjectStats:
+    """Everything a single project walk collects"""
+    size_bytes: int = 0
+    file_count: int = 0
+    exts: Counter = field(default_factory=Counter)  # top-level file extensions
+    markers: set = field(default_factory=set)  # top-level marker file names
+    has_venv: bool = False
+
+
+# ASCII stand-ins for the console emoji when stdout can't encode them
+# (e.g. a Windows cp1252 console)
+_ASCII_MARKERS = {
+    '🚀': '[*]', '📡': '[>]', '🏷️': '[#]', '🔧': '[~]', '⏱️': '[t]', '📋': '[=]',
+    '✅': '[ok]', '❌': '[x]', '🔍': '[?]', '🔄': '[~]', '💡': '[i]', '🛑': '[!]'
+}
+_UNICODE_CONSOLE = (getattr(sys.stdout, 'encoding', None) or '').lower().replace('-', '').startswith('utf')
+
+
+def _ui(text):
+    """Console text with emoji replaced by ASCII markers on non-UTF-8 terminals"""
+    if _UNICODE_CONSOLE:
+        return text
+    for glyph, marker in _ASCII_MARKERS.items():
+        text = text.replace(glyph, marker)
+    return text
+
+
+# Simple logging (collectors log from worker threads, keep lines whole)
+_log_lock = threading.Lock()
+
 def log(message, level="INFO"):
     timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-    print(f"[{timestamp}] [{level}] {message}")
+    with _log_lock:
+        print(f"[{timestamp}] [{level}] {message}")
+
+
+def _load_requests():
+    """Import requests on first use"""
+    global requests
+    if requests is None:
+        import requests as module
+        requests = module
+    return requests
+
+
+def _load_psutil():
+    """Import psutil on first use"""
+    global psutil
+    if psutil is None:
+        import psutil as module
+        psutil = module
+    return psutil
+
+
+def _ttl_cache(seconds):
+    """Reuse a no-argument function's result for the given number of seconds"""
+    def decorator(func):
+        cached = {}
+        
+        @functools.wraps(func)
+        def wrapper():
+            now = time.monotonic()
+            if 'value' not in cached or now - cached['at'] >= seconds:
+                cached['value'] = func()
+                cached['at'] = now
+            return cached['value']
+        return wrapper
+    return decorator
+
+
+# OS capacity counters only need refreshing every few seconds
+@_ttl_cache(seconds=5)
+def _virtual_memory():
+    return psutil.virtual_memory()
+
+
+@_ttl_cache(seconds=5)
+def _disk_usage_root():
+    return psutil.disk_usage('/')
+
+
+# os.getloadavg is missing on Windows; resolve it once at import
+_GETLOADAVG = getattr(os, 'getloadavg', lambda: (0.0, 0.0, 0.0))
+
+
+@_ttl_cache(seconds=5)
+def _load_average():
+    return _GETLOADAVG()
+
 # where are the logs saved ?
 class SimpleAgent:
     """Simplified agent that collects and reports system data"""
     
-    def __init__(self, management_server_url, agent_name=None):
+    def __init__(self, management_server_url, agent_name=None, scan_root=None):
         self.management_server_url = management_server_url.rstrip('/')
         self.agent_id = str(uuid.uuid4())
-        self.agent_name = agent_name or socket.gethostname()
+        
+        # Where to look for Git repositories
+        self.scan_root = os.path.abspath(os.path.expanduser(scan_root)) if scan_root else str(Path.home())
+        
+        # Host facts never change while the agent runs
+        self.hostname = socket.gethostname()
+        self.platform = platform.system()
+        self.architecture = platform.machine()
+        self.python_version = platform.python_version()
+        self.agent_name = agent_name or self.hostname
+        
+        # Set when psutil's CPU counter is primed by the first sample
+        self._cpu_sampled_at = None
+        self._cpu_last_value = None
+        self._boot_time = None
+        self._cpu_count = None
+        
+        # One keep-alive session for every request to the management server
+        _load_requests()
+        from urllib3.util.retry import Retry
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = USER_AGENT
+        # Retry briefly when the server is restarting or behind a busy proxy.
+        # urllib3 leaves POST out by default, but every call here posts. A
+        # retried POST can store a report twice; registration is an upsert and
+        # the server reads the latest report, so a duplicate row is harmless
+        retries = Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504),
+                        allowed_methods=frozenset({'GET', 'POST'}))
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=retries)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        # Tool availability is probed on first use and cached
+        self._docker_module = None
+        self._docker_client = None
+        self._docker_ok = None
+        self._kubectl_ok = None
+        
+        # Registration happens once; server capabilities are probed once
+        self._registered = False
+        self._server_capabilities = None
+        
+        # Set by run_once so every payload in a cycle shares one timestamp
+        self._cycle_timestamp = None
+        
+        # Project analysis from the previous cycle:
+        # path -> (HEAD mtime, index mtime, project info)
+        self._project_cache = {}
+        
+        # Continuous mode hands finished cycles to a background sender so a
+        # slow server never delays the next collection (see _start_sender)
+        self._send_queue = None
         
         log(f"Agent initialized: {self.agent_name} ({self.agent_id})")
     
+    def _now(self):
+        """UTC timestamp of the running cycle (or of right now outside a cycle)"""
+        return self._cycle_timestamp or time.strftime(ISO_FORMAT, time.gmtime())
+    
     def register_agent(self):
         """Register agent with management server"""
         try:
             registration_data = {
                 'agent_id': self.agent_id,
                 'agent_name': self.agent_name,
-                'hostname': socket.gethostname(),
-                'platform': platform.system(),
-                'architecture': platform.machine(),
-                'python_version': platform.python_version(),
-                'registered_at': time.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                'hostname': self.hostname,
+                'platform': self.platform,
+                'architecture': self.architecture,
+                'python_version': self.python_version,
+                'registered_at': self._now(),
                 'capabilities': {
                     'projects': True,
                     'docker': self._docker_available(),
@@ -51,10 +295,11 @@ class SimpleAgent:
                 }
             }
             
-            response = requests.post(
+            response = self.session.post(
                 f"{self.management_server_url}/api/agents/register",
-                json=registration_data,
-                timeout=10
+                data=json_dumps(registration_data),
+                headers=JSON_HEADERS,
+                timeout=HTTP_TIMEOUT
             )
             
             if response.status_code == 200:
@@ -75,46 +320,75 @@ class SimpleAgent:
         # you either never run lynt or are escaping lynt that suppose to create error out of this: not to import libraries during the script
         # either do it at the beginning or separate the function from the script, make library of it and import at the beginning to make it
         # implamnetable
-        try:
-            import docker
-            client = docker.from_env()
-            client.ping()
-            return True
-        except Exception:
-            return False
+        # Probed once per process; the client is kept for collect_docker_info
+        if self._docker_ok is None:
+            try:
+                import docker
+                self._docker_module = docker
+                self._docker_client = docker.from_env(timeout=5)
+                self._docker_client.ping()
+                self._docker_ok = True
+            except Exception:
+                self._docker_client = None
+                self._docker_ok = False
+        return self._docker_ok
     
     def _kubectl_available(self):
         # there is a library for k8s just like for docker and it works in the same way
         # same things that goes for  docker goes for this.
         """Check if kubectl is available"""
-        try:
-            result = subprocess.run(['kubectl', 'version', '--client'], 
-                                  capture_output=True, timeout=5)
-            return result.returncode == 0
-        except Exception:
-            return False
+        # A PATH lookup is enough; 'kubectl version' forks and can hang
+        if self._kubectl_ok is None:
+            self._kubectl_ok = shutil.which('kubectl') is not None
+        return self._kubectl_ok
+    
+    def _sample_cpu_percent(self):
+        """CPU usage since the previous sample, without blocking for a full second"""
+        # Prime psutil so cpu_percent(interval=None) returns the usage since
+        # the previous call. It needs a short window after priming; in
+        # continuous mode the sleep between cycles already provides it.
+        if self._cpu_sampled_at is None:
+            psutil.cpu_percent(interval=None)
+            self._cpu_sampled_at = time.monotonic()
+        elapsed = time.monotonic() - self._cpu_sampled_at
+        if elapsed < CPU_MIN_SAMPLE_WINDOW:
+            # Too soon for a meaningful delta: reuse the last reading, and
+            # only wait out the window when there is nothing to reuse yet.
+            if self._cpu_last_value is not None:
+                return self._cpu_last_value
+            time.sleep(CPU_MIN_SAMPLE_WINDOW - elapsed)
+        self._cpu_sampled_at = time.monotonic()
+        self._cpu_last_value = psutil.cpu_percent(interval=None)
+        return self._cpu_last_value
     
     def collect_system_info(self):
         """Collect system information"""
         try:
+            _load_psutil()
+            if self._boot_time is None:
+                # Boot time and core count don't change while the agent runs
+                self._boot_time = psutil.boot_time()
+                self._cpu_count = psutil.cpu_count()
+            memory = _virtual_memory()
+            disk = _disk_usage_root()
             return {
                 'agent_id': self.agent_id,
                 'agent_name': self.agent_name,
-                'hostname': socket.gethostname(),
-                'timestamp': time.strftime("%Y-%m-%dT%H:%M:%SZ"),
-                'platform': platform.system(),
-                'architecture': platform.machine(),
-                'python_version': platform.python_version(),
-                'cpu_count': psutil.cpu_count(),
-                'cpu_percent': psutil.cpu_percent(interval=1),
-                'memory_total': round(psutil.virtual_memory().total / (1024**3), 2),
-                'memory_available': round(psutil.virtual_memory().available / (1024**3), 2),
-                'memory_percent': psutil.virtual_memory().percent,
-                'disk_total': round(psutil.disk_usage('/').total / (1024**3), 2),
-                'disk_used': round(psutil.disk_usage('/').used / (1024**3), 2),
-                'disk_percent': psutil.disk_usage('/').percent,
-                'uptime': time.time() - psutil.boot_time(),
-                'load_average': os.getloadavg() if hasattr(os, 'getloadavg') else [0, 0, 0]
+                'hostname': self.hostname,
+                'timestamp': self._now(),
+                'platform': self.platform,
+                'architecture': self.architecture,
+                'python_version': self.python_version,
+                'cpu_count': self._cpu_count,
+                'cpu_percent': self._sample_cpu_percent(),
+                'memory_total': round(memory.total / GIB, 2),
+                'memory_available': round(memory.available / GIB, 2),
+                'memory_percent': memory.percent,
+                'disk_total': round(disk.total / GIB, 2),
+                'disk_used': round(disk.used / GIB, 2),
+                'disk_percent': disk.percent,
+                'uptime': time.time() - self._boot_time,
+                'load_average': _load_average()
             }
         except Exception as e:
             log(f"Error collecting system info: {e}", "ERROR")
@@ -126,7 +400,7 @@ class SimpleAgent:
             projects = self._find_git_projects()
             return {
                 'agent_id': self.agent_id,
-                'timestamp': time.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                'timestamp': self._now(),
                 'projects': projects,
                 'total_projects': len(projects)
             }
@@ -136,146 +410,209 @@ class SimpleAgent:
     
     def _find_git_projects(self):
         """Find Git repositories"""
-        # pygit library is easier to use for this
+        # Breadth-first os.scandir walk: DirEntry.is_dir() uses the cached
+        # d_type, dependency/build dirs are pruned and we never descend into
+        # a directory once it turns out to be a repo.
         projects = []
-        base_path = Path.home()
+        seen = {}
         
         try:
-            # Simple search - look for .git directories
-            for git_dir in base_path.rglob('.git'):
-                if git_dir.is_dir():
-                    project_path = git_dir.parent
-                    project_info = self._analyze_project(project_path)
-                    if project_info:
-                        projects.append(project_info)
-                        if len(projects) >= 20:  # Limit for POC
-                            break
+            # A dotfiles repo at the scan root should not hide everything else
+            is_repo, subdirs = self._list_subdirs(self.scan_root)
+            if is_repo:
+                project_info = self._analyze_project_cached(self.scan_root, seen)
+                if project_info:
+                    projects.append(project_info)
+            
+            # Walk the usual project folders (~/code, ~/src, ...) before the
+            # rest, so the project limit is usually hit without touching them
+            priority = deque(d for d in subdirs if os.path.basename(d).lower() in PRIORITY_DIRS)
+            fallback = deque(d for d in subdirs if os.path.basename(d).lower() not in PRIORITY_DIRS)
+            
+            for pending in (priority, fallback):
+                while pending and len(projects) < MAX_PROJECTS:
+                    current = pending.popleft()
+                    is_repo, subdirs = self._list_subdirs(current)
+                    if is_repo:
+                        project_info = self._analyze_project_cached(current, seen)
+                        if project_info:
+                            projects.append(project_info)
+                    else:
+                        pending.extend(subdirs)
         except Exception as e:
             log(f"Error finding projects: {e}", "ERROR")
         
+        # Repositories that disappeared drop out of the cache
+        self._project_cache = seen
         return projects
     
+    def _list_subdirs(self, path):
+        """Return (has a .git entry, subdirectories worth walking) for path"""
+        subdirs = []
+        is_repo = False
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    # A .git directory, or a .git file in worktrees/submodules
+                    if entry.name == '.git':
+                        is_repo = True
+                        continue
+                    try:
+                        if not entry.is_dir(follow_symlinks=False):
+                            continue
+                    except OSError:
+                        continue
+                    if entry.name in SKIP_DIRS or entry.name.startswith('.'):
+                        continue
+                    subdirs.append(entry.path)
+        except OSError:
+            pass
+        return is_repo, subdirs
+    
+    def _analyze_project_cached(self, project_dir, seen):
+        """Reuse last cycle's analysis while .git/HEAD and .git/index are unchanged"""
+        git_dir = self._git_dir(project_dir)
+        try:
+            head_mtime = os.stat(os.path.join(git_dir, 'HEAD')).st_mtime
+        except OSError:
+            # No readable HEAD: always analyze
+            return self._analyze_project(Path(project_dir))
+        try:
+            index_mtime = os.stat(os.path.join(git_dir, 'index')).st_mtime
+        except OSError:
+            index_mtime = 0.0
+        
+        cached = self._project_cache.get(project_dir)
+        if cached and cached[:2] == (head_mtime, index_mtime):
+            project_info = cached[2]
+        else:
+            project_info = self._analyze_project(Path(project_dir))
+        
+        if project_info:
+            seen[project_dir] = (head_mtime, index_mtime, project_info)
+        return project_info
+    
     def _analyze_project(self, project_path):
         """Analyze a project directory"""
         try:
+            stats = self._scan_project(project_path)
             return {
                 'name': project_path.name,
                 'path': str(project_path),
-                'size': self._calculate_size(project_path),
-                'file_count': self._count_files(project_path),
-                'project_type': self._detect_project_type(project_path),
-                'libraries': self._find_libraries(project_path),
-                'has_venv': self._check_venv(project_path),
+                'size': round(stats.size_bytes / (1024 * 1024), 2),
+                'file_count': min(stats.file_count, MAX_SCAN_FILES),
+                'project_type': self._detect_project_type(stats),
+                'libraries': self._find_libraries(project_path, stats.markers),
+                'has_venv': stats.has_venv,
                 'git_branch': self._get_git_branch(project_path)
             }
         except Exception as e:
             log(f"Error analyzing project {project_path}: {e}", "ERROR")
             return None
     
-    def _calculate_size(self, path):
-        """Calculate directory size in MB"""
-        try:
-            total_size = 0
-            for dirpath, dirnames, filenames in os.walk(path):
-                for filename in filenames:
-                    file_path = os.path.join(dirpath, filename)
+    def _scan_project(self, path):
+        """Walk a project once, collecting size, file count and top-level markers"""
+        stats = ProjectStats()
+        stack = [(str(path), 0)]
+        
+        while stack:
+            current, depth = stack.pop()
+            top_level = depth == 0
+            try:
+                entries = os.scandir(current)
+            except OSError:
+                continue
+            
+            with entries:
+                for entry in entries:
+                    name = entry.name
+                    if top_level and name in VENV_NAMES:
+                        stats.has_venv = True
                     try:
-                        total_size += os.path.getsize(file_path)
-                    except (OSError, FileNotFoundError):
+                        if entry.is_dir(follow_symlinks=False):
+                            # Dependency/build trees would dominate the size
+                            if name not in SKIP_DIRS and depth < MAX_SCAN_DEPTH:
+                                stack.append((entry.path, depth + 1))
+                            continue
+                        # Files follow symlinks, so a linked requirements.txt still counts
+                        if not entry.is_file():
+                            continue
+                        if stats.size_bytes <= MAX_SCAN_BYTES:
+                            stats.size_bytes += entry.stat().st_size
+                    except OSError:
                         continue
-                if total_size > 500 * 1024 * 1024:  # Stop at 500MB for performance
-                    break
-            return round(total_size / (1024 * 1024), 2)
-        except Exception:
-            return 0
-    
-    def _count_files(self, path):
-        """Count files in directory"""
-        try:
-            count = 0
-            for _, _, files in os.walk(path):
-                count += len(files)
-                if count > 10000:  # Limit for performance
-                    break
-            return min(count, 10000)
-        except Exception:
-            return 0
+                    
+                    stats.file_count += 1
+                    if top_level:
+                        ext = os.path.splitext(name)[1].lower()
+                        if ext:
+                            stats.exts[ext] += 1
+                        if name.lower() in MARKER_FILES:
+                            stats.markers.add(name)
+                    
+                    # Stop at 500MB / 10k files for performance. Each cap only ends
+                    # its own metric, so many tiny files still get their size summed
+                    if stats.size_bytes > MAX_SCAN_BYTES and stats.file_count > MAX_SCAN_FILES:
+                        return stats
+        
+        return stats
     
-    def _detect_project_type(self, path):
+    def _detect_project_type(self, stats):
         """Detect project type"""
-        type_indicators = {
-            'python': ['.py', 'requirements.txt', 'setup.py', 'pyproject.toml'],
-            'javascript': ['.js', '.ts', 'package.json'],
-            'java': ['.java', 'pom.xml', 'build.gradle'],
-            'go': ['.go', 'go.mod'],
-            'rust': ['.rs', 'Cargo.toml'],
-            'docker': ['Dockerfile', 'docker-compose.yml']
-        }
+        detected_types = set()
+        for ext in stats.exts:
+            detected_types.update(EXT_TO_TYPES.get(ext, ()))
+        for name in stats.markers:
+            detected_types.update(NAME_TO_TYPES.get(name.lower(), ()))
         
-        detected_types = []
-        try:
-            for file_path in path.iterdir():
-                if file_path.is_file():
-                    file_name = file_path.name.lower()
-                    file_ext = file_path.suffix.lower()
-                    
-                    for proj_type, indicators in type_indicators.items():
-                        for indicator in indicators:
-                            if indicator.startswith('.') and file_ext == indicator:
-                                detected_types.append(proj_type)
-                            elif not indicator.startswith('.') and file_name == indicator.lower():
-                                detected_types.append(proj_type)
-        except Exception:
-            pass
-        
-        return list(set(detected_types)) if detected_types else ['unknown']
+        return list(detected_types) if detected_types else ['unknown']
     
-    def _find_libraries(self, path):
+    def _find_libraries(self, path, markers):
         """Find project libraries"""
         libraries = []
         try:
-            # Python requirements
-            req_file = path / 'requirements.txt'
-            if req_file.exists():
-                with open(req_file, 'r') as f:
-                    for line in f:
-                        line = line.strip()
-                        if line and not line.startswith('#'):
-                            lib_name = line.split('==')[0].split('>=')[0].split('<=')[0]
-                            libraries.append(lib_name)
-                            if len(libraries) >= 10:  # Limit for POC
-                                break
+            # Python requirements (bytes: only the names get decoded)
+            if 'requirements.txt' in markers:
+                with open(path / 'requirements.txt', 'rb') as f:
+                    data = f.read(MAX_MANIFEST_BYTES).removeprefix(codecs.BOM_UTF8)
+                # Limit for POC
+                libraries.extend(match[1].decode('ascii') for match in islice(_REQ_NAME.finditer(data), 10))
             
             # Node.js package.json
-            package_json = path / 'package.json'
-            if package_json.exists():
-                with open(package_json, 'r') as f:
-                    data = json.load(f)
-                    if 'dependencies' in data:
-                        libraries.extend(list(data['dependencies'].keys())[:5])
+            if 'package.json' in markers:
+                with open(path / 'package.json', 'rb') as f:
+                    data = json_loads(f.read(MAX_MANIFEST_BYTES))
+                libraries.extend(islice(data.get('dependencies') or {}, 5))
         except Exception:
             pass
         
         return libraries[:10]  # Limit to 10 libraries
     
-    def _check_venv(self, path):
-        """Check for virtual environment"""
-        venv_indicators = ['.venv', 'venv', '.env', 'env']
-        for indicator in venv_indicators:
-            if (path / indicator).exists():
-                return True
-        return False
+    def _git_dir(self, project_dir):
+        """The repository's git directory, following a worktree's .git file"""
+        git_path = os.path.join(project_dir, '.git')
+        if os.path.isfile(git_path):
+            # Worktrees and submodules have a ".git" file with "gitdir: <path>"
+            try:
+                with open(git_path, encoding='utf-8') as f:
+                    pointer = f.readline().strip()
+            except (OSError, UnicodeDecodeError):
+                return git_path
+            if pointer.startswith('gitdir:'):
+                return os.path.join(project_dir, pointer[len('gitdir:'):].strip())
+        return git_path
     
     def _get_git_branch(self, path):
         """Get current Git branch"""
+        # HEAD holds "ref: refs/heads/<branch>", or a commit SHA when detached
         try:
-            result = subprocess.run(
-                ['git', 'branch', '--show-current'],
-                cwd=path, capture_output=True, text=True, timeout=5
-            )
-            return result.stdout.strip() if result.returncode == 0 else 'unknown'
-        except Exception:
+            with open(os.path.join(self._git_dir(path), 'HEAD'), encoding='utf-8') as f:
+                head = f.read().strip()
+        except (OSError, UnicodeDecodeError):
             return 'unknown'
+        if head.startswith('ref: refs/heads/'):
+            return head[len('ref: refs/heads/'):]
+        return head[:7] or 'unknown'
     
     def collect_docker_info(self):
         """Collect Docker information"""
@@ -283,44 +620,34 @@ class SimpleAgent:
             if not self._docker_available():
                 return {'agent_id': self.agent_id, 'available': False}
             
-            import docker
-            client = docker.from_env()
+            # The low-level API returns every field we need from the list
+            # calls, without an inspect round trip per container/image
+            api = self._docker_client.api
+            image_list = api.images()
+            image_tags = {image['Id']: self._image_tags(image) for image in image_list}
             
-            # Get running containers
+            # One listing of all containers, split into running and stopped here
             running_containers = []
-            for container in client.containers.list():
-                running_containers.append({
-                    'id': container.short_id,
-                    'name': container.name,
-                    'image': container.image.tags[0] if container.image.tags else 'unknown',
-                    'status': container.status,
-                    'created': container.attrs['Created']
-                })
-            
-            # Get stopped containers (limited)
             stopped_containers = []
-            for container in client.containers.list(all=True, filters={'status': 'exited'})[:5]:
-                stopped_containers.append({
-                    'id': container.short_id,
-                    'name': container.name,
-                    'image': container.image.tags[0] if container.image.tags else 'unknown',
-                    'status': container.status,
-                    'created': container.attrs['Created']
-                })
+            for container in api.containers(all=True):
+                if container['State'] == 'running':
+                    running_containers.append(self._format_container(container, image_tags))
+                elif container['State'] == 'exited' and len(stopped_containers) < 5:
+                    stopped_containers.append(self._format_container(container, image_tags))
             
             # Get images (limited)
             images = []
-            for image in client.images.list()[:10]:
+            for image in image_list[:10]:
                 images.append({
-                    'id': image.short_id,
-                    'tags': image.tags,
-                    'size': round(image.attrs['Size'] / (1024 * 1024), 2),
-                    'created': image.attrs['Created']
+                    'id': self._short_image_id(image['Id']),
+                    'tags': image_tags[image['Id']],
+                    'size': round(image['Size'] / (1024 * 1024), 2),
+                    'created': self._iso_time(image['Created'])
                 })
             
             return {
                 'agent_id': self.agent_id,
-                'timestamp': time.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                'timestamp': self._now(),
                 'available': True,
                 'containers': {
                     'running': running_containers,
@@ -332,37 +659,68 @@ class SimpleAgent:
             log(f"Error collecting Docker info: {e}", "ERROR")
             return {'agent_id': self.agent_id, 'available': False, 'error': str(e)}
     
+    def _format_container(self, container, image_tags):
+        """Shape a low-level container listing like the agent payload expects"""
+        tags = image_tags.get(container['ImageID'])
+        return {
+            'id': container['Id'][:12],
+            'name': container['Names'][0].lstrip('/') if container['Names'] else container['Id'][:12],
+            'image': tags[0] if tags else 'unknown',
+            'status': container['State'],
+            'created': self._iso_time(container['Created'])
+        }
+    
+    def _image_tags(self, image):
+        """Image tags without the '<none>:<none>' placeholder"""
+        return [tag for tag in image.get('RepoTags') or [] if tag != '<none>:<none>']
+    
+    def _short_image_id(self, image_id):
+        """Short image ID the way docker-py reports it"""
+        return image_id[:19] if image_id.startswith('sha256:') else image_id[:12]
+    
+    def _iso_time(self, epoch):
+        """Docker list timestamps are epoch seconds; the dashboard expects ISO"""
+        return time.strftime(ISO_FORMAT, time.gmtime(epoch))
+    
     def collect_ssh_info(self):
         """Collect SSH key information"""
         # i am not sure this is wise or secured.
         try:
-            ssh_dir = Path.home() / '.ssh'
+            ssh_dir = os.path.join(os.path.expanduser('~'), '.ssh')
             keys = []
             
-            if ssh_dir.exists():
-                for key_file in ssh_dir.glob('id_*'):
-                    if key_file.is_file() and not key_file.name.endswith('.pub'):
-                        keys.append({
-                            'name': key_file.name,
-                            'path': str(key_file),
-                            'type': self._determine_key_type(key_file),
-                            'has_public': (key_file.with_suffix(key_file.suffix + '.pub')).exists(),
-                            'size': key_file.stat().st_size,
-                            'modified': key_file.stat().st_mtime
-                        })
+            # One listing of ~/.ssh; public keys are matched by name, not stat
+            try:
+                with os.scandir(ssh_dir) as entries:
+                    files = {entry.name: entry for entry in entries if entry.is_file()}
+            except (FileNotFoundError, NotADirectoryError):
+                files = {}
+            
+            for name, entry in files.items():
+                if not name.startswith('id_') or name.endswith('.pub'):
+                    continue
+                stat = entry.stat()
+                keys.append({
+                    'name': name,
+                    'path': entry.path,
+                    'type': self._determine_key_type(name),
+                    'has_public': name + '.pub' in files,
+                    'size': stat.st_size,
+                    'modified': stat.st_mtime
+                })
             
             return {
                 'agent_id': self.agent_id,
-                'timestamp': time.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                'timestamp': self._now(),
                 'ssh_keys': keys
             }
         except Exception as e:
             log(f"Error collecting SSH info: {e}", "ERROR")
             return {'agent_id': self.agent_id, 'ssh_keys': [], 'error': str(e)}
     
-    def _determine_key_type(self, key_path):
+    def _determine_key_type(self, key_name):
         """Determine SSH key type"""
-        name = key_path.name.lower()
+        name = key_name.lower()
         if 'rsa' in name:
             return 'RSA'
         elif 'ed25519' in name:
@@ -376,10 +734,19 @@ class SimpleAgent:
     def send_data(self, endpoint, data):
         """Send data to management server"""
         try:
-            response = requests.post(
+            body = json_dumps(data)
+            headers = JSON_HEADERS
+            # Projects/Docker payloads compress well; tiny ones aren't worth it.
+            # Servers without the gzip capability can't inflate request bodies
+            if len(body) > GZIP_MIN_BYTES and self._server_supports('gzip'):
+                body = gzip.compress(body, compresslevel=1)
+                headers = GZIP_JSON_HEADERS
+            
+            response = self.session.post(
                 f"{self.management_server_url}/api/agents/{endpoint}",
-                json=data,
-                timeout=10
+                data=body,
+                headers=headers,
+                timeout=HTTP_TIMEOUT
             )
             
             if response.status_code == 200:
@@ -396,47 +763,136 @@ class SimpleAgent:
     def run_once(self):
         """Run a single data collection and send cycle"""
         log("Starting data collection cycle")
+        self._cycle_timestamp = time.strftime(ISO_FORMAT, time.gmtime())
+        try:
+            return self._run_cycle()
+        finally:
+            self._cycle_timestamp = None
+    
+    def _run_cycle(self):
+        """Register, collect and send; run_once wraps this with the cycle timestamp"""
+        # Register agent (once - the server tracks us by agent_id afterwards)
+        if not self._registered:
+            if not self.register_agent():
+                log("Failed to register agent", "ERROR")
+                return False
+            self._registered = True
         
-        # Register agent
-        if not self.register_agent():
-            log("Failed to register agent", "ERROR")
-            return False
-        
-        # Collect and send system info
-        system_data = self.collect_system_info()
-        if system_data:
-            self.send_data('system', system_data)
-        
-        # Collect and send projects
-        log("Collecting projects...")
-        projects_data = self.collect_projects()
-        if projects_data:
-            self.send_data('projects', projects_data)
+        # The collectors are independent and I/O-bound, so run them side by side
+        log("Collecting system, projects, Docker and SSH info...")
+        collectors = [
+            ('system', self.collect_system_info),
+            ('projects', self.collect_projects),
+            ('docker', self.collect_docker_info),
+            ('ssh', self.collect_ssh_info)
+        ]
+        with ThreadPoolExecutor(max_workers=len(collectors)) as executor:
+            futures = [(endpoint, executor.submit(collect)) for endpoint, collect in collectors]
+            results = [(endpoint, future.result()) for endpoint, future in futures]
+        payloads = [(endpoint, data) for endpoint, data in results if data]
         
-        # Collect and send Docker info
-        log("Collecting Docker info...")
-        docker_data = self.collect_docker_info()
-        if docker_data:
-            self.send_data('docker', docker_data)
+        if self._server_supports('tick'):
+            # One round trip for the whole cycle
+            tick = {'agent_id': self.agent_id, 'timestamp': self._now()}
+            tick.update(payloads)
+            payloads = [('tick', tick)]
         
-        # Collect and send SSH info
-        log("Collecting SSH info...")
-        ssh_data = self.collect_ssh_info()
-        if ssh_data:
-            self.send_data('ssh', ssh_data)
+        if self._send_queue is not None:
+            self._enqueue(payloads)
+        else:
+            self._send_payloads(payloads)
         
         log("Data collection cycle completed")
         return True
     
+    def _send_payloads(self, payloads):
+        """Send one cycle's (endpoint, data) pairs"""
+        if not payloads:
+            return True
+        if len(payloads) == 1:
+            sent = self.send_data(*payloads[0])
+        else:
+            # Older servers: one POST per endpoint over the shared session
+            with ThreadPoolExecutor(max_workers=len(payloads)) as executor:
+                sends = [executor.submit(self.send_data, endpoint, data)
+                         for endpoint, data in payloads]
+                sent = all(send.result() for send in sends)
+        
+        # The server may have lost us (e.g. a fresh database): register again next cycle
+        if not sent:
+            self._registered = False
+        return sent
+    
+    def _start_sender(self):
+        """Send cycles from a daemon thread instead of the collection loop"""
+        if self._send_queue is None:
+            self._send_queue = queue.Queue(maxsize=SEND_QUEUE_SIZE)
+            threading.Thread(target=self._sender_loop, name='agent-sender', daemon=True).start()
+    
+    def _sender_loop(self):
+        while True:
+            payloads = self._send_queue.get()
+            try:
+                self._send_payloads(payloads)
+            except Exception as e:
+                log(f"Error in sender thread: {e}", "ERROR")
+    
+    def _enqueue(self, payloads):
+        """Queue a cycle for sending, dropping the oldest one when the server lags"""
+        while True:
+            try:
+                self._send_queue.put_nowait(payloads)
+                return
+            except queue.Full:
+                try:
+                    self._send_queue.get_nowait()
+                    log("Send queue full, dropped the oldest cycle", "WARNING")
+                except queue.Empty:
+                    pass
+    
+    def _server_supports(self, feature):
+        """Whether the management server advertises an optional feature"""
+        if self._server_capabilities is None:
+            try:
+                response = self.session.get(
+                    f"{self.management_server_url}/api/capabilities",
+                    timeout=HTTP_TIMEOUT
+                )
+            except Exception as e:
+                # Timeout or server restarting: leave it unknown and ask again next cycle
+                log(f"Could not read server capabilities: {e}", "WARNING")
+                return False
+            if response.status_code >= 500:
+                log(f"Could not read server capabilities: {response.status_code}", "WARNING")
+                return False
+            # Any other answer is definitive; an older server has no such endpoint
+            try:
+                capabilities = response.json() if response.status_code == 200 else {}
+            except ValueError:
+                capabilities = {}
+            self._server_capabilities = capabilities if isinstance(capabilities, dict) else {}
+        return bool(self._server_capabilities.get(feature))
+    
     def run_continuous(self, interval=30):
         """Run continuous monitoring"""
         log(f"Starting continuous monitoring (interval: {interval}s)")
         
+        self._start_sender()
         try:
+            # Sleep until the next absolute deadline so cycle time doesn't
+            # push every later cycle back
+            next_tick = time.monotonic()
             while True:
                 self.run_once()
-                log(f"Sleeping for {interval} seconds...")
-                time.sleep(interval)
+                next_tick += interval
+                delay = next_tick - time.monotonic()
+                if delay < 0:
+                    # The cycle overran: skip the missed ticks instead of bursting
+                    log(f"Cycle took longer than {interval}s, starting the next one now", "WARNING")
+                    next_tick = time.monotonic()
+                    continue
+                log(f"Sleeping for {delay:.1f} seconds...")
+                time.sleep(delay)
         except KeyboardInterrupt:
             log("Agent stopped by user")
         except Exception as e:
@@ -446,26 +902,28 @@ class SimpleAgent:
 def get_user_input():
     """Interactive mode to get user input"""
     print("=" * 60)
-    print("🚀 DevOps Organizer Agent - Interactive Setup")
+    print(_ui("🚀 DevOps Organizer Agent - Interactive Setup"))
     print("=" * 60)
     print()
     
-    # Get server URL
+    # Get server URL (Enter keeps $DEVOPS_AGENT_SERVER when it is set)
+    default_server = os.environ.get('DEVOPS_AGENT_SERVER', '')
+    hint = f"[{default_server}]" if default_server else "(e.g., http://192.168.1.100:8085)"
     while True:
-        server = input("📡 Management server URL (e.g., http://192.168.1.100:8085): ").strip()
+        server = input(_ui(f"📡 Management server URL {hint}: ")).strip() or default_server
         if server:
             if not server.startswith(('http://', 'https://')):
                 server = 'http://' + server
             break
-        print("❌ Server URL is required!")
+        print(_ui("❌ Server URL is required!"))
     
     # Get agent name
-    agent_name = input(f"🏷️  Agent name (press Enter for '{socket.gethostname()}'): ").strip()
+    agent_name = input(_ui(f"🏷️  Agent name (press Enter for '{socket.gethostname()}'): ")).strip()
     if not agent_name:
         agent_name = None
     
     # Get execution mode
-    print("\n🔧 Execution mode:")
+    print(_ui("\n🔧 Execution mode:"))
     print("1. Test connection (run once and exit)")
     print("2. Continuous monitoring")
     
@@ -473,7 +931,7 @@ def get_user_input():
         mode = input("Choose mode (1 or 2): ").strip()
         if mode in ['1', '2']:
             break
-        print("❌ Please enter 1 or 2")
+        print(_ui("❌ Please enter 1 or 2"))
     
     run_once = (mode == '1')
     interval = 30
@@ -481,29 +939,35 @@ def get_user_input():
     # Get interval if continuous mode
     if not run_once:
         while True:
-            interval_input = input(f"⏱️  Report interval in seconds (press Enter for {interval}): ").strip()
+            interval_input = input(_ui(f"⏱️  Report interval in seconds (press Enter for {interval}): ")).strip()
             if not interval_input:
                 break
             try:
                 interval = int(interval_input)
                 if interval < 10:
-                    print("❌ Interval must be at least 10 seconds")
+                    print(_ui("❌ Interval must be at least 10 seconds"))
                     continue
                 break
             except ValueError:
-                print("❌ Please enter a valid number")
+                print(_ui("❌ Please enter a valid number"))
     
-    print("\n" + "=" * 60)
-    print("📋 Configuration Summary:")
-    print(f"   Server: {server}")
-    print(f"   Agent: {agent_name or socket.gethostname()}")
-    print(f"   Mode: {'Test run (once)' if run_once else f'Continuous (every {interval}s)'}")
-    print("=" * 60)
+    # One write for the whole summary
+    summary = [
+        "",
+        "=" * 60,
+        _ui("📋 Configuration Summary:"),
+        f"   Server: {server}",
+        f"   Agent: {agent_name or socket.gethostname()}",
+        f"   Mode: {'Test run (once)' if run_once else f'Continuous (every {interval}s)'}",
+        "=" * 60
+    ]
+    sys.stdout.write("\n".join(summary) + "\n")
+    sys.stdout.flush()
     
     # Confirm
-    confirm = input("\n✅ Start agent with these settings? (Y/n): ").strip().lower()
+    confirm = input(_ui("\n✅ Start agent with these settings? (Y/n): ")).strip().lower()
     if confirm and confirm not in ['y', 'yes']:
-        print("❌ Cancelled by user")
+        print(_ui("❌ Cancelled by user"))
         sys.exit(0)
     
     return server, agent_name, run_once, interval
@@ -512,11 +976,14 @@ def get_user_input():
 def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(description='DevOps Organizer Simple Agent')
-    parser.add_argument('--server', help='Management server URL')
-    parser.add_argument('--name', help='Agent name (default: hostname)')
+    parser.add_argument('--server', default=os.environ.get('DEVOPS_AGENT_SERVER'),
+                        help='Management server URL (default: $DEVOPS_AGENT_SERVER)')
+    parser.add_argument('--name', default=os.environ.get('DEVOPS_AGENT_NAME'),
+                        help='Agent name (default: $DEVOPS_AGENT_NAME or hostname)')
     parser.add_argument('--interval', type=int, default=30, help='Report interval in seconds')
     parser.add_argument('--once', action='store_true', help='Run once and exit')
     parser.add_argument('--interactive', action='store_true', help='Force interactive mode')
+    parser.add_argument('--scan-root', help='Directory to search for Git projects (default: home directory)')
     
     args = parser.parse_args()
     
@@ -525,7 +992,7 @@ def main():
         try:
             server, agent_name, run_once, interval = get_user_input()
         except KeyboardInterrupt:
-            print("\n\n❌ Cancelled by user")
+            print(_ui("\n\n❌ Cancelled by user"))
             sys.exit(0)
     else:
         server = args.server
@@ -533,32 +1000,33 @@ def main():
         run_once = args.once
         interval = args.interval
     
-    print(f"\n🚀 Starting DevOps Organizer Agent...")
+    print(_ui(f"\n🚀 Starting DevOps Organizer Agent..."))
     
     # Create and run agent
     try:
         agent = SimpleAgent(
             management_server_url=server,
-            agent_name=agent_name
+            agent_name=agent_name,
+            scan_root=args.scan_root
         )
         
         if run_once:
-            print("🔍 Running test connection...")
+            print(_ui("🔍 Running test connection..."))
             success = agent.run_once()
             if success:
-                print("✅ Test completed successfully!")
+                print(_ui("✅ Test completed successfully!"))
             else:
-                print("❌ Test failed - check server connection")
+                print(_ui("❌ Test failed - check server connection"))
             sys.exit(0 if success else 1)
         else:
-            print(f"🔄 Starting continuous monitoring (interval: {interval}s)")
-            print("💡 Press Ctrl+C to stop")
+            print(_ui(f"🔄 Starting continuous monitoring (interval: {interval}s)"))
+            print(_ui("💡 Press Ctrl+C to stop"))
             agent.run_continuous(interval)
     except KeyboardInterrupt:
-        print("\n\n🛑 Agent stopped by user")
+        print(_ui("\n\n🛑 Agent stopped by user"))
         sys.exit(0)
     except Exception as e:
-        print(f"\n❌ Agent error: {e}")
+        print(_ui(f"\n❌ Agent error: {e}"))
         sys.exit(1)
 
 
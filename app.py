@@ -5,36 +5,343 @@ A comprehensive tool for managing local projects, Docker containers, K3s cluster
 """
 
 import os
-import json
-import subprocess
-import platform
+import io
+import logging
+import logging.handlers
+import re
+import zlib
+import time
+import orjson
 from pathlib import Path
-from flask import Flask, render_template, jsonify, request
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from flask import Flask, Response, render_template, jsonify, request
+from flask.json.provider import JSONProvider
 import docker
 from kubernetes import client, config
 from datetime import datetime, timedelta
+import functools
 import threading
+import queue
+import atexit
 import sqlite3
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import tomllib  # Python 3.11+
+except ImportError:
+    tomllib = None
 
 app = Flask(__name__)
 
+# Upper bound for an inflated gzip request body
+MAX_INFLATED_BYTES = 16 * 1024 * 1024
+
+# Idle SQLite connections kept by AgentDataStore
+DB_POOL_SIZE = 8
+
+# Seconds between deletions of agent data older than 24 hours
+CLEANUP_INTERVAL = 3600
+
+# An agent is online if seen within the first window, warning within the second
+AGENT_ONLINE_WINDOW = timedelta(minutes=2)
+AGENT_WARNING_WINDOW = timedelta(minutes=10)
+
+# Kinds of agent report in the agent_data table. The keys are the names of the
+# per-kind tables older databases used, which _migrate_legacy_tables folds in
+AGENT_DATA_KINDS = {
+    'system_data': 0,
+    'projects_data': 1,
+    'docker_data': 2,
+    'k3s_data': 3,
+    'ssh_data': 4
+}
+
+# Files that identify a project type: extensions start with '.', the rest are file or directory names
+PROJECT_TYPE_INDICATORS = {
+    'python': ['.py', 'requirements.txt', 'setup.py', 'pyproject.toml', 'Pipfile'],
+    'javascript': ['.js', '.ts', 'package.json', 'node_modules'],
+    'java': ['.java', 'pom.xml', 'build.gradle', '.gradle'],
+    'csharp': ['.cs', '.csproj', '.sln'],
+    'rust': ['.rs', 'Cargo.toml', 'Cargo.lock'],
+    'go': ['.go', 'go.mod', 'go.sum'],
+    'php': ['.php', 'composer.json'],
+    'ruby': ['.rb', 'Gemfile'],
+    'cpp': ['.cpp', '.cc', '.cxx', '.hpp', '.h', 'CMakeLists.txt'],
+    'docker': ['Dockerfile', 'docker-compose.yml'],
+    'terraform': ['.tf', '.tfvars']
+}
+
+# The same table inverted for one dict lookup per file (keys lowercase)
+EXT_TO_PROJECT_TYPE = {
+    indicator.lower(): proj_type
+    for proj_type, indicators in PROJECT_TYPE_INDICATORS.items()
+    for indicator in indicators if indicator.startswith('.')
+}
+NAME_TO_PROJECT_TYPE = {
+    indicator.lower(): proj_type
+    for proj_type, indicators in PROJECT_TYPE_INDICATORS.items()
+    for indicator in indicators if not indicator.startswith('.')
+}
+# Indicators that are directories, checked before the walk prunes or descends into them
+DIR_TO_PROJECT_TYPE = {
+    indicator.lower(): proj_type
+    for proj_type, indicators in PROJECT_TYPE_INDICATORS.items()
+    for indicator in indicators if indicator in ('node_modules', '.gradle')
+}
+
+# Seconds a Docker listing is reused across dashboard requests
+DOCKER_CACHE_TTL = 2.0
+
+# Seconds an aggregated agent listing is reused across dashboard requests
+AGGREGATE_CACHE_TTL = 2.0
+
+# Items serialized together per chunk of a streamed JSON array
+STREAM_CHUNK_ITEMS = 256
+
+# Seconds the AI context text is reused while no agent data changes
+# (it shows agent status, which ages without any new report)
+CONTEXT_CACHE_TTL = 30.0
+
+# Sections of a combined /api/agents/tick report, each one agent_data kind
+TICK_SECTIONS = ('system', 'projects', 'docker', 'k3s', 'ssh')
+
+# Reply to an upload whose body is not a JSON object with an agent_id
+INVALID_BODY_RESPONSE = ({'status': 'error', 'message': 'Request body must be a JSON object with an agent_id'}, 400)
+
+# (connect, read) timeouts for the model runner; only generation is slow
+LLM_STATUS_TIMEOUT = (3, 5)
+LLM_CHAT_TIMEOUT = (3, 30)
+
+# SSH private key file names (the same set the old glob patterns matched)
+SSH_KEY_NAME_RE = re.compile(r'^(id_.*|.*_(rsa|dsa|ecdsa|ed25519))$')
+
+# Objects per page when listing from the Kubernetes API
+K8S_PAGE_SIZE = 500
+
+# Directories never searched for Git repositories
+GIT_SCAN_PRUNE = frozenset({'node_modules', '.venv', 'venv', '__pycache__', '.cache', 'Library'})
+
+# Threads analysing discovered projects in parallel
+PROJECT_SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Directories not descended into when scanning a project
+PROJECT_SCAN_PRUNE = frozenset({'node_modules', '.git', 'venv', '.venv', '__pycache__'})
+
+# Package name at the start of a requirements.txt line (comments and
+# pip options such as -r / -e don't start with a name character)
+REQUIREMENT_NAME_RE = re.compile(rb'^[ \t]*([A-Za-z0-9][A-Za-z0-9._-]*)', re.MULTILINE)
+
+# Module path of a go.mod requirement, on a "require" line or inside a require block
+GO_REQUIRE_RE = re.compile(rb'^[ \t]*(?:require[ \t]+)?([^\s()]+)[ \t]+v\d', re.MULTILINE)
+
+
+# Parsed manifests kept by _mtime_cache
+MANIFEST_CACHE_SIZE = 512
+
+# Seconds within which a repeated identical log message is dropped
+LOG_DUPLICATE_WINDOW = 1.0
+
+
+class _DuplicateFilter(logging.Filter):
+    """Drop a log record identical to one emitted less than LOG_DUPLICATE_WINDOW ago"""
+    
+    def __init__(self):
+        super().__init__()
+        self._last_seen = {}
+        self._lock = threading.Lock()
+    
+    def filter(self, record):
+        key = (record.name, record.levelno, record.getMessage())
+        now = time.monotonic()
+        with self._lock:
+            last = self._last_seen.get(key)
+            if last is not None and now - last < LOG_DUPLICATE_WINDOW:
+                return False
+            if len(self._last_seen) > 1024:
+                self._last_seen.clear()
+            self._last_seen[key] = now
+        return True
+
+
+logger = logging.getLogger(__name__)
+
+# Request threads only enqueue records; a listener thread writes them to stderr
+_log_queue = queue.SimpleQueue()
+_log_handler = logging.handlers.QueueHandler(_log_queue)
+_log_handler.addFilter(_DuplicateFilter())
+logger.addHandler(_log_handler)
+logger.setLevel(logging.INFO)
+logger.propagate = False
+_log_stream = logging.StreamHandler()
+_log_stream.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_stream)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+
+def _mtime_cache(parse):
+    """Memoize a ProjectFinder manifest parser on (path, mtime, size)"""
+    # A missing file parses to an empty list, so callers needn't check exists()
+    cache = OrderedDict()
+    lock = threading.Lock()
+    
+    @functools.wraps(parse)
+    def wrapper(self, file_path):
+        try:
+            stat = file_path.stat()
+        except OSError:
+            return []
+        key = (str(file_path), stat.st_mtime_ns, stat.st_size)
+        with lock:
+            if key in cache:
+                cache.move_to_end(key)
+                return cache[key]
+        libraries = parse(self, file_path)
+        with lock:
+            cache[key] = libraries
+            if len(cache) > MANIFEST_CACHE_SIZE:
+                cache.popitem(last=False)
+        return libraries
+    return wrapper
+
+
+class GzipRequestMiddleware:
+    """Inflate gzip-encoded request bodies (sent by agents) before Flask parses them"""
+    
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+    
+    def __call__(self, environ, start_response):
+        if environ.get('HTTP_CONTENT_ENCODING', '').lower() == 'gzip':
+            try:
+                length = int(environ.get('CONTENT_LENGTH') or 0)
+            except ValueError:
+                length = -1
+            if length < 0:
+                return self._bad_request('Invalid Content-Length')(environ, start_response)
+            inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)  # gzip framing
+            try:
+                body = inflater.decompress(environ['wsgi.input'].read(length), MAX_INFLATED_BYTES)
+            except zlib.error:
+                return self._bad_request('Invalid gzip body')(environ, start_response)
+            if inflater.unconsumed_tail:
+                return self._bad_request('Inflated body too large')(environ, start_response)
+            # A body cut off in transit inflates without error but never reaches the gzip trailer
+            if not inflater.eof:
+                return self._bad_request('Truncated gzip body')(environ, start_response)
+            environ['wsgi.input'] = io.BytesIO(body)
+            environ['CONTENT_LENGTH'] = str(len(body))
+            del environ['HTTP_CONTENT_ENCODING']
+        return self.wsgi_app(environ, start_response)
+    
+    @staticmethod
+    def _bad_request(message):
+        """A 400 reply in the same shape as the ingestion routes' errors"""
+        return Response(orjson.dumps({'status': 'error', 'message': message}),
+                        status=400, mimetype='application/json')
+
+
+app.wsgi_app = GzipRequestMiddleware(app.wsgi_app)
+
+
+class OrjsonProvider(JSONProvider):
+    """Back jsonify() and request.get_json() with orjson instead of the json module"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+app.json = OrjsonProvider(app)
+
+
+def json_response(obj, status=200):
+    """Return an API payload as orjson bytes, skipping jsonify's str round trip"""
+    return Response(orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS),
+                    status=status, mimetype='application/json')
+
+
+def json_stream_response(items):
+    """Stream an iterable as a JSON array, STREAM_CHUNK_ITEMS items per chunk"""
+    def generate():
+        iterator = iter(items)
+        opening = b'['
+        while True:
+            chunk = list(islice(iterator, STREAM_CHUNK_ITEMS))
+            if not chunk:
+                break
+            # One dumps() per chunk; drop its brackets to splice into the array
+            yield opening + orjson.dumps(chunk, option=orjson.OPT_NON_STR_KEYS)[1:-1]
+            opening = b','
+        yield b'[]' if opening == b'[' else b']'
+    return Response(generate(), mimetype='application/json')
+
 class AgentDataStore:
     """Store and manage agent data using SQLite"""
     
-    def __init__(self, db_path='agents.db'):
+    def __init__(self, db_path='agents.db', on_cleanup=None):
         self.db_path = db_path
+        # Called after the cleanup deleted rows, so caches of them can be dropped
+        self.on_cleanup = on_cleanup
+        # Idle connections kept open between calls so SQLite's page cache stays warm
+        self._pool = queue.LifoQueue(maxsize=DB_POOL_SIZE)
+        self._stop = threading.Event()
         self.init_database()
-        self._cleanup_thread = threading.Timer(3600, self._cleanup_old_data)  # Cleanup every hour
-        self._cleanup_thread.daemon = True
+        # One long-lived thread runs the hourly cleanup until close()
+        self._cleanup_thread = threading.Thread(target=self._cleanup_loop, daemon=True)
         self._cleanup_thread.start()
+        # Registered last, so a failed init_database() isn't followed by a failing close()
+        atexit.register(self.close)
+    
+    def _acquire(self):
+        """Take an idle connection from the pool, or open a new one"""
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            pass
+        # Flask serves requests from several threads; a connection is only
+        # ever used by one of them at a time
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute('PRAGMA synchronous = NORMAL')  # safe with WAL
+        conn.execute('PRAGMA mmap_size = 268435456')  # 256MB
+        conn.execute('PRAGMA temp_store = MEMORY')
+        conn.execute('PRAGMA cache_size = -64000')  # 64MB
+        return conn
+    
+    def _release(self, conn):
+        """Return a connection to the pool, discarding any unfinished transaction"""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            self._pool.put_nowait(conn)
+        except (sqlite3.Error, queue.Full):
+            conn.close()
+    
+    def close(self):
+        """Stop the cleanup thread and close all idle pooled connections"""
+        self._stop.set()
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
     
     def init_database(self):
         """Initialize the database schema"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._acquire()
         try:
             cursor = conn.cursor()
             
+            # page_size only applies to a new database, so set it before any table
+            # exists; WAL lets agent writes proceed alongside dashboard reads
+            cursor.execute('PRAGMA page_size = 8192')
+            cursor.execute('PRAGMA journal_mode = WAL')
+            
             # Agents table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS agents (
@@ -51,75 +358,65 @@ class AgentDataStore:
                 )
             ''')
             
-            # System data table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS system_data (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    agent_id TEXT,
-                    timestamp TEXT,
-                    data TEXT,
-                    FOREIGN KEY (agent_id) REFERENCES agents (agent_id)
-                )
-            ''')
-            
-            # Projects data table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS projects_data (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    agent_id TEXT,
-                    timestamp TEXT,
-                    data TEXT,
-                    FOREIGN KEY (agent_id) REFERENCES agents (agent_id)
-                )
-            ''')
-            
-            # Docker data table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS docker_data (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    agent_id TEXT,
-                    timestamp TEXT,
-                    data TEXT,
-                    FOREIGN KEY (agent_id) REFERENCES agents (agent_id)
-                )
-            ''')
-            
-            # K3s data table
+            # Agent reports of every kind (system, projects, ...) share one table
             cursor.execute('''
-                CREATE TABLE IF NOT EXISTS k3s_data (
+                CREATE TABLE IF NOT EXISTS agent_data (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     agent_id TEXT,
+                    kind INTEGER NOT NULL,
                     timestamp TEXT,
-                    data TEXT,
+                    data BLOB,
                     FOREIGN KEY (agent_id) REFERENCES agents (agent_id)
                 )
             ''')
             
-            # SSH data table
+            # Latest-row-per-agent lookups seek on (kind, agent_id, timestamp);
+            # the hourly cleanup deletes by timestamp alone
             cursor.execute('''
-                CREATE TABLE IF NOT EXISTS ssh_data (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    agent_id TEXT,
-                    timestamp TEXT,
-                    data TEXT,
-                    FOREIGN KEY (agent_id) REFERENCES agents (agent_id)
-                )
+                CREATE INDEX IF NOT EXISTS idx_agent_data_kind_agent_ts
+                ON agent_data (kind, agent_id, timestamp DESC)
             ''')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_agent_data_ts ON agent_data (timestamp)')
             
+            self._migrate_legacy_tables(cursor)
             conn.commit()
         finally:
-            conn.close()
+            self._release(conn)
+    
+    def _migrate_legacy_tables(self, cursor):
+        """Move rows from the old one-table-per-kind schema into agent_data"""
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        existing = {row[0] for row in cursor.fetchall()}
+        for table, kind in AGENT_DATA_KINDS.items():
+            if table in existing:
+                # Names come from AGENT_DATA_KINDS, never from a caller
+                cursor.execute(f'''
+                    INSERT INTO agent_data (agent_id, kind, timestamp, data)
+                    SELECT agent_id, ?, timestamp, data FROM {table}
+                ''', (kind,))
+                cursor.execute(f'DROP TABLE {table}')
     
     def register_agent(self, agent_data):
         """Register a new agent"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._acquire()
         try:
             cursor = conn.cursor()
+            # Upsert: a re-registering agent keeps its row (and registered_at)
+            # instead of INSERT OR REPLACE's delete and re-insert
             cursor.execute('''
-                INSERT OR REPLACE INTO agents 
+                INSERT INTO agents 
                 (agent_id, agent_name, hostname, platform, architecture, python_version, 
                  registered_at, last_seen, capabilities, status)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 'active')
+                ON CONFLICT (agent_id) DO UPDATE SET
+                    agent_name = excluded.agent_name,
+                    hostname = excluded.hostname,
+                    platform = excluded.platform,
+                    architecture = excluded.architecture,
+                    python_version = excluded.python_version,
+                    last_seen = excluded.last_seen,
+                    capabilities = excluded.capabilities,
+                    status = 'active'
             ''', (
                 agent_data['agent_id'],
                 agent_data['agent_name'],
@@ -129,243 +426,352 @@ class AgentDataStore:
                 agent_data['python_version'],
                 agent_data['registered_at'],
                 datetime.utcnow().isoformat(),
-                json.dumps(agent_data['capabilities'])
+                orjson.dumps(agent_data['capabilities'])
             ))
             conn.commit()
             return True
-        except Exception as e:
-            print(f"Error registering agent: {e}")
+        except Exception:
+            logger.exception("Error registering agent")
             return False
         finally:
-            conn.close()
+            self._release(conn)
     
     def update_agent_last_seen(self, agent_id):
         """Update agent last seen timestamp"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._acquire()
         try:
             cursor = conn.cursor()
             cursor.execute('''
                 UPDATE agents SET last_seen = ? WHERE agent_id = ?
             ''', (datetime.utcnow().isoformat(), agent_id))
             conn.commit()
-        except Exception as e:
-            print(f"Error updating agent last seen: {e}")
+        except Exception:
+            logger.exception("Error updating agent last seen")
         finally:
-            conn.close()
+            self._release(conn)
     
     def store_agent_data(self, table, data):
         """Store agent data in specified table"""
-        conn = sqlite3.connect(self.db_path)
+        self.store_agent_data_bulk([(table, data)])
+    
+    def store_agent_data_bulk(self, entries):
+        """Store several (table, data) reports and bump last_seen in one transaction"""
+        timestamp = datetime.utcnow().isoformat()
+        conn = self._acquire()
         try:
+            rows = []
+            agent_ids = set()
+            for table, data in entries:
+                rows.append((data['agent_id'], self._kind(table), timestamp, orjson.dumps(data)))
+                agent_ids.add(data['agent_id'])
+            
             cursor = conn.cursor()
-            cursor.execute(f'''
-                INSERT INTO {table} (agent_id, timestamp, data)
-                VALUES (?, ?, ?)
-            ''', (data['agent_id'], datetime.utcnow().isoformat(), json.dumps(data)))
+            cursor.executemany('''
+                INSERT INTO agent_data (agent_id, kind, timestamp, data)
+                VALUES (?, ?, ?, ?)
+            ''', rows)
+            cursor.executemany(
+                'UPDATE agents SET last_seen = ? WHERE agent_id = ?',
+                [(timestamp, agent_id) for agent_id in agent_ids]
+            )
             conn.commit()
-            self.update_agent_last_seen(data['agent_id'])
-        except Exception as e:
-            print(f"Error storing agent data: {e}")
+        except Exception:
+            logger.exception("Error storing agent data")
         finally:
-            conn.close()
+            self._release(conn)
+    
+    def agent_exists(self, agent_id):
+        """Check whether an agent is registered"""
+        conn = self._acquire()
+        try:
+            cursor = conn.cursor()
+            cursor.execute('SELECT 1 FROM agents WHERE agent_id = ?', (agent_id,))
+            return cursor.fetchone() is not None
+        except Exception:
+            logger.exception("Error checking agent")
+            return False
+        finally:
+            self._release(conn)
     
     def get_agents(self):
         """Get all registered agents"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._acquire()
         try:
             cursor = conn.cursor()
             cursor.execute('SELECT * FROM agents ORDER BY last_seen DESC')
             rows = cursor.fetchall()
             
-            agents = []
-            for row in rows:
-                agent = {
-                    'agent_id': row[0],
-                    'agent_name': row[1],
-                    'hostname': row[2],
-                    'platform': row[3],
-                    'architecture': row[4],
-                    'python_version': row[5],
-                    'registered_at': row[6],
-                    'last_seen': row[7],
-                    'capabilities': json.loads(row[8]) if row[8] else {},
-                    'status': self._get_agent_status(row[7])
-                }
-                agents.append(agent)
+            cutoffs = self._status_cutoffs()
+            return [self._agent_from_row(row, cutoffs) for row in rows]
+        except Exception:
+            logger.exception("Error getting agents")
+            return []
+        finally:
+            self._release(conn)
+    
+    def get_agents_with_latest(self, table):
+        """Get all agents paired with their latest row from table, in one query"""
+        conn = self._acquire()
+        try:
+            cursor = conn.cursor()
+            # SQLite takes the bare data column from the row holding MAX(timestamp)
+            cursor.execute('''
+                SELECT a.*, latest.data FROM agents a
+                LEFT JOIN (
+                    SELECT agent_id, data, MAX(timestamp) FROM agent_data
+                    WHERE kind = ?
+                    GROUP BY agent_id
+                ) latest ON latest.agent_id = a.agent_id
+                ORDER BY a.last_seen DESC
+            ''', (self._kind(table),))
+            rows = cursor.fetchall()
             
-            return agents
-        except Exception as e:
-            print(f"Error getting agents: {e}")
+            cutoffs = self._status_cutoffs()
+            return [
+                (self._agent_from_row(row, cutoffs), orjson.loads(row[10]) if row[10] else None)
+                for row in rows
+            ]
+        except Exception:
+            logger.exception("Error getting agents with data")
             return []
         finally:
-            conn.close()
+            self._release(conn)
+    
+    def _agent_from_row(self, row, cutoffs):
+        """Build an agent dict from an agents table row"""
+        return {
+            'agent_id': row[0],
+            'agent_name': row[1],
+            'hostname': row[2],
+            'platform': row[3],
+            'architecture': row[4],
+            'python_version': row[5],
+            'registered_at': row[6],
+            'last_seen': row[7],
+            'capabilities': orjson.loads(row[8]) if row[8] else {},
+            'status': self._get_agent_status(row[7], cutoffs)
+        }
+    
+    def _kind(self, table):
+        """agent_data kind for a report table name such as 'system_data'"""
+        try:
+            return AGENT_DATA_KINDS[table]
+        except KeyError:
+            raise ValueError(f"Unknown agent data table: {table}") from None
+    
+    def _latest_rows(self, cursor, table):
+        """(agent_id, data) of each agent's newest row, newest agent first"""
+        # One grouped pass over the (kind, agent_id, timestamp) index; SQLite
+        # takes the bare data column from the row that holds MAX(timestamp)
+        cursor.execute('''
+            SELECT agent_id, data, MAX(timestamp) AS latest FROM agent_data
+            WHERE kind = ?
+            GROUP BY agent_id
+            ORDER BY latest DESC
+        ''', (self._kind(table),))
+        return cursor.fetchall()
     
     def get_latest_agent_data(self, table, agent_id=None):
         """Get latest data from specified table"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._acquire()
         try:
             cursor = conn.cursor()
             
             if agent_id:
-                cursor.execute(f'''
-                    SELECT data FROM {table} 
-                    WHERE agent_id = ? 
+                cursor.execute('''
+                    SELECT data FROM agent_data
+                    WHERE kind = ? AND agent_id = ?
                     ORDER BY timestamp DESC LIMIT 1
-                ''', (agent_id,))
+                ''', (self._kind(table), agent_id))
                 row = cursor.fetchone()
-                return json.loads(row[0]) if row else None
+                return orjson.loads(row[0]) if row else None
             else:
                 # Get latest data from each agent
-                cursor.execute(f'''
-                    SELECT agent_id, data FROM {table} t1
-                    WHERE timestamp = (
-                        SELECT MAX(timestamp) FROM {table} t2 
-                        WHERE t2.agent_id = t1.agent_id
-                    )
-                    ORDER BY timestamp DESC
-                ''')
-                rows = cursor.fetchall()
-                return [json.loads(row[1]) for row in rows]
+                rows = self._latest_rows(cursor, table)
+                return [orjson.loads(row[1]) for row in rows]
         
-        except Exception as e:
-            print(f"Error getting agent data: {e}")
+        except Exception:
+            logger.exception("Error getting agent data")
             return [] if not agent_id else None
         finally:
-            conn.close()
+            self._release(conn)
     
     def get_all_agent_data(self, table):
         """Get all data from specified table grouped by agent"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._acquire()
         try:
             cursor = conn.cursor()
-            cursor.execute(f'''
-                SELECT agent_id, data FROM {table} t1
-                WHERE timestamp = (
-                    SELECT MAX(timestamp) FROM {table} t2 
-                    WHERE t2.agent_id = t1.agent_id
-                )
-                ORDER BY timestamp DESC
-            ''')
-            rows = cursor.fetchall()
+            rows = self._latest_rows(cursor, table)
             
             result = {}
             for row in rows:
                 agent_id = row[0]
-                data = json.loads(row[1])
+                data = orjson.loads(row[1])
                 result[agent_id] = data
             
             return result
-        except Exception as e:
-            print(f"Error getting all agent data: {e}")
+        except Exception:
+            logger.exception("Error getting all agent data")
             return {}
         finally:
-            conn.close()
+            self._release(conn)
     
-    def _get_agent_status(self, last_seen_str):
+    def _status_cutoffs(self):
+        """ISO timestamps separating online / warning / offline, computed once per query"""
+        now = datetime.utcnow()
+        return (now - AGENT_ONLINE_WINDOW).isoformat(), (now - AGENT_WARNING_WINDOW).isoformat()
+    
+    def _get_agent_status(self, last_seen_str, cutoffs):
         """Determine agent status based on last seen time"""
-        try:
-            last_seen = datetime.fromisoformat(last_seen_str.replace('Z', '+00:00'))
-            now = datetime.utcnow()
-            time_diff = now - last_seen
-            
-            if time_diff < timedelta(minutes=2):
-                return 'online'
-            elif time_diff < timedelta(minutes=10):
-                return 'warning'
-            else:
-                return 'offline'
-        except Exception:
+        # last_seen is always written as datetime.utcnow().isoformat(), and
+        # such ISO strings order the same way as the times they encode
+        if not last_seen_str:
             return 'unknown'
+        online_after, warning_after = cutoffs
+        if last_seen_str > online_after:
+            return 'online'
+        elif last_seen_str > warning_after:
+            return 'warning'
+        else:
+            return 'offline'
     
     def _cleanup_old_data(self):
-        """Clean up old data (keep last 24 hours)"""
+        """Clean up old data (keep last 24 hours); returns the number of rows deleted"""
         cutoff_time = (datetime.utcnow() - timedelta(hours=24)).isoformat()
         
-        tables = ['system_data', 'projects_data', 'docker_data', 'k3s_data', 'ssh_data']
-        
-        conn = sqlite3.connect(self.db_path)
+        conn = self._acquire()
         try:
             cursor = conn.cursor()
-            for table in tables:
-                cursor.execute(f'DELETE FROM {table} WHERE timestamp < ?', (cutoff_time,))
+            cursor.execute('DELETE FROM agent_data WHERE timestamp < ?', (cutoff_time,))
             conn.commit()
-        except Exception as e:
-            print(f"Error cleaning up old data: {e}")
+            return cursor.rowcount
+        except Exception:
+            logger.exception("Error cleaning up old data")
+            return 0
         finally:
-            conn.close()
-        
-        # Schedule next cleanup
-        self._cleanup_thread = threading.Timer(3600, self._cleanup_old_data)
-        self._cleanup_thread.daemon = True
-        self._cleanup_thread.start()
+            self._release(conn)
+    
+    def _cleanup_loop(self):
+        """Clean up old data every hour"""
+        while not self._stop.wait(CLEANUP_INTERVAL):
+            if self._cleanup_old_data() and self.on_cleanup:
+                self.on_cleanup()
 
 
 class AgentManager:
     """Manage agents and their data"""
     
     def __init__(self):
-        self.data_store = AgentDataStore()
+        # table -> (fetched at, aggregate); see _cached
+        self._cache = {}
+        # Bumped after every store, registration or cleanup so derived views
+        # can tell whether agent data changed since they were built
+        self.data_version = 0
+        # Guards data_version together with the _cache entries built from it
+        self._version_lock = threading.Lock()
+        # Tells this process's versions apart from an earlier run's in ETags
+        self.data_token = format(time.time_ns(), 'x')
+        self.data_store = AgentDataStore(on_cleanup=self._data_changed)
+    
+    def _data_changed(self, tables=None):
+        """Bump data_version, then drop the aggregates of tables (all when None)"""
+        with self._version_lock:
+            self.data_version += 1
+            if tables is None:
+                self._cache.clear()
+            else:
+                for table in tables:
+                    self._cache.pop(table, None)
+    
+    def _cached(self, table, fetch):
+        """Return fetch()'s result, reusing it for AGGREGATE_CACHE_TTL seconds"""
+        now = time.monotonic()
+        cached = self._cache.get(table)
+        if cached and now - cached[0] < AGGREGATE_CACHE_TTL:
+            return cached[1]
+        version = self.data_version
+        value = fetch()
+        with self._version_lock:
+            # A change during fetch() may have been missed; don't keep a stale result
+            if self.data_version == version:
+                self._cache[table] = (now, value)
+        return value
+    
+    def _store(self, table, data):
+        """Store one report and drop the stale aggregate of its kind"""
+        self.data_store.store_agent_data(table, data)
+        self._data_changed((table,))
     
     def register_agent(self, agent_data):
         """Register a new agent"""
-        return self.data_store.register_agent(agent_data)
+        registered = self.data_store.register_agent(agent_data)
+        # Aggregates carry agent names, so none of them survive a registration
+        self._data_changed()
+        return registered
     
     def get_agents(self):
         """Get all agents"""
         return self.data_store.get_agents()
     
+    def is_registered(self, agent_id):
+        """Check whether an agent is registered"""
+        return self.data_store.agent_exists(agent_id)
+    
     def store_system_data(self, data):
         """Store system data from agent"""
-        self.data_store.store_agent_data('system_data', data)
+        self._store('system_data', data)
     
     def store_projects_data(self, data):
         """Store projects data from agent"""
-        self.data_store.store_agent_data('projects_data', data)
+        self._store('projects_data', data)
     
     def store_docker_data(self, data):
         """Store Docker data from agent"""
-        self.data_store.store_agent_data('docker_data', data)
+        self._store('docker_data', data)
     
     def store_k3s_data(self, data):
         """Store K3s data from agent"""
-        self.data_store.store_agent_data('k3s_data', data)
+        self._store('k3s_data', data)
     
     def store_ssh_data(self, data):
         """Store SSH data from agent"""
-        self.data_store.store_agent_data('ssh_data', data)
+        self._store('ssh_data', data)
+    
+    def store_tick_data(self, tick):
+        """Store every section of a combined agent report in one transaction"""
+        entries = []
+        for section in TICK_SECTIONS:
+            data = tick.get(section)
+            if data:
+                # The tick's agent_id is the one the route checked is registered
+                data['agent_id'] = tick['agent_id']
+                entries.append((f'{section}_data', data))
+        if entries:
+            self.data_store.store_agent_data_bulk(entries)
+            self._data_changed([table for table, _ in entries])
     
     def get_aggregated_system_info(self):
         """Get aggregated system information from all agents"""
-        agents_data = self.data_store.get_all_agent_data('system_data')
-        agents = self.data_store.get_agents()
-        
-        result = []
-        for agent in agents:
-            agent_id = agent['agent_id']
-            system_data = agents_data.get(agent_id, {})
-            
-            result.append({
-                'agent': agent,
-                'system': system_data
-            })
-        
-        return result
+        return self._cached('system_data', lambda: [
+            {'agent': agent, 'system': system_data or {}}
+            for agent, system_data in self.data_store.get_agents_with_latest('system_data')
+        ])
     
     def get_aggregated_projects(self):
         """Get aggregated projects from all agents"""
-        return self.data_store.get_all_agent_data('projects_data')
+        return self._cached('projects_data', lambda: self.data_store.get_all_agent_data('projects_data'))
     
     def get_aggregated_docker(self):
         """Get aggregated Docker data from all agents"""
-        return self.data_store.get_all_agent_data('docker_data')
+        return self._cached('docker_data', lambda: self.data_store.get_all_agent_data('docker_data'))
     
     def get_aggregated_k3s(self):
         """Get aggregated K3s data from all agents"""
-        return self.data_store.get_all_agent_data('k3s_data')
+        return self._cached('k3s_data', lambda: self.data_store.get_all_agent_data('k3s_data'))
     
     def get_aggregated_ssh(self):
         """Get aggregated SSH data from all agents"""
-        return self.data_store.get_all_agent_data('ssh_data')
+        return self._cached('ssh_data', lambda: self.data_store.get_all_agent_data('ssh_data'))
 
 
 # Initialize agent manager
@@ -377,6 +783,8 @@ class ProjectFinder:
     def __init__(self):
         self.home_dir = Path.home()
         self.custom_path = None
+        # path -> (HEAD mtime, index mtime, project info) from earlier scans
+        self._project_cache = {}
     
     def set_custom_path(self, path):
         """Set custom search path"""
@@ -386,201 +794,219 @@ class ProjectFinder:
         """Find all Git repositories in the specified directory"""
         base_path = search_path or self.custom_path or self.home_dir
         projects = []
+        seen = {}
         
         try:
-            # Use find command for better performance on Unix systems
-            if platform.system() != 'Windows':
-                result = subprocess.run(
-                    ['find', str(base_path), '-name', '.git', '-type', 'd'],
-                    capture_output=True, text=True, timeout=30
-                )
-                git_dirs = result.stdout.strip().split('\n') if result.stdout.strip() else []
-            else:
-                # Fallback for Windows
-                git_dirs = []
-                for root, dirs, files in os.walk(base_path):
-                    if '.git' in dirs:
-                        git_dirs.append(os.path.join(root, '.git'))
-            
-            for git_dir in git_dirs:
-                if git_dir:
-                    project_path = Path(git_dir).parent
-                    project_info = self._analyze_project(project_path)
-                    if project_info:
-                        projects.append(project_info)
+            # Each analysis is a filesystem walk, so they overlap well in threads
+            project_paths = [Path(repo) for repo in self._walk_git_repos(str(base_path))]
+            if project_paths:
+                workers = min(PROJECT_SCAN_WORKERS, len(project_paths))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    results = executor.map(
+                        functools.partial(self._analyze_project_cached, seen=seen),
+                        project_paths
+                    )
+                    projects = [project_info for project_info in results if project_info]
         
-        except Exception as e:
-            print(f"Error finding projects: {e}")
+        except Exception:
+            logger.exception("Error finding projects")
         
+        # Repositories that disappeared, or lie outside this search path, drop out of the cache
+        self._project_cache = seen
         return projects
     
+    def _walk_git_repos(self, root):
+        """Yield directories holding a .git directory, without descending into them"""
+        stack = [root]
+        while stack:
+            current = stack.pop()
+            subdirs = []
+            is_repo = False
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        try:
+                            if not entry.is_dir(follow_symlinks=False):
+                                continue
+                        except OSError:
+                            continue
+                        if entry.name == '.git':
+                            is_repo = True
+                            break
+                        if entry.name not in GIT_SCAN_PRUNE:
+                            subdirs.append(entry.path)
+            except OSError:
+                continue
+            
+            if is_repo:
+                yield current
+            else:
+                # Reversed so siblings are visited in directory order
+                stack.extend(reversed(subdirs))
+    
+    def _analyze_project_cached(self, project_path, seen):
+        """Reuse the previous analysis while .git/HEAD and .git/index are unchanged"""
+        git_dir = project_path / '.git'
+        try:
+            head_mtime = (git_dir / 'HEAD').stat().st_mtime
+        except OSError:
+            return self._analyze_project(project_path)
+        try:
+            index_mtime = (git_dir / 'index').stat().st_mtime
+        except OSError:
+            index_mtime = 0.0
+        
+        cached = self._project_cache.get(project_path)
+        if cached and cached[:2] == (head_mtime, index_mtime):
+            project_info = cached[2]
+        else:
+            project_info = self._analyze_project(project_path)
+        
+        if project_info:
+            seen[project_path] = (head_mtime, index_mtime, project_info)
+        return project_info
+    
     def _analyze_project(self, project_path):
         """Analyze a project directory for details"""
         try:
+            scan = self._scan_project(project_path)
             project_info = {
                 'name': project_path.name,
                 'path': str(project_path),
-                'size': self._calculate_size(project_path),
-                'file_count': self._count_files(project_path),
-                'project_type': self._detect_project_type(project_path),
+                'size': scan['size'],
+                'file_count': scan['file_count'],
+                'project_type': scan['project_type'],
                 'libraries': self._find_libraries(project_path),
                 'has_venv': self._check_venv(project_path),
                 'git_branch': self._get_git_branch(project_path)
             }
             return project_info
-        except Exception as e:
-            print(f"Error analyzing project {project_path}: {e}")
+        except Exception:
+            logger.exception("Error analyzing project %s", project_path)
             return None
     
-    def _calculate_size(self, path):
-        """Calculate directory size in MB"""
-        try:
-            total_size = 0
-            for dirpath, dirnames, filenames in os.walk(path):
-                for filename in filenames:
-                    file_path = os.path.join(dirpath, filename)
+    def _scan_project(self, path):
+        """Walk a project once for its size, file count and project types"""
+        total_size = 0
+        file_count = 0
+        detected_types = set()
+        
+        stack = [str(path)]
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    # DirEntry caches the file type and, on most platforms, the stat
                     try:
-                        total_size += os.path.getsize(file_path)
-                    except (OSError, FileNotFoundError):
+                        if entry.is_dir(follow_symlinks=False):
+                            proj_type = DIR_TO_PROJECT_TYPE.get(entry.name.lower())
+                            if proj_type:
+                                detected_types.add(proj_type)
+                            # Dependency trees and VCS data aren't part of the project
+                            if entry.name not in PROJECT_SCAN_PRUNE:
+                                stack.append(entry.path)
+                            continue
+                        if not entry.is_file(follow_symlinks=False):
+                            continue
+                        total_size += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
                         continue
-            return round(total_size / (1024 * 1024), 2)  # Convert to MB
-        except Exception:
-            return 0
-    
-    def _count_files(self, path):
-        """Count total files in directory"""
-        try:
-            count = 0
-            for _, _, files in os.walk(path):
-                count += len(files)
-            return count
-        except Exception:
-            return 0
-    
-    def _detect_project_type(self, path):
-        """Detect project type based on file extensions and config files"""
-        type_indicators = {
-            'python': ['.py', 'requirements.txt', 'setup.py', 'pyproject.toml', 'Pipfile'],
-            'javascript': ['.js', '.ts', 'package.json', 'node_modules'],
-            'java': ['.java', 'pom.xml', 'build.gradle', '.gradle'],
-            'csharp': ['.cs', '.csproj', '.sln'],
-            'rust': ['.rs', 'Cargo.toml', 'Cargo.lock'],
-            'go': ['.go', 'go.mod', 'go.sum'],
-            'php': ['.php', 'composer.json'],
-            'ruby': ['.rb', 'Gemfile'],
-            'cpp': ['.cpp', '.cc', '.cxx', '.hpp', '.h', 'CMakeLists.txt'],
-            'docker': ['Dockerfile', 'docker-compose.yml'],
-            'terraform': ['.tf', '.tfvars']
-        }
-        
-        detected_types = []
-        
-        try:
-            # Check for specific files
-            for file_path in path.rglob('*'):
-                if file_path.is_file():
-                    file_name = file_path.name.lower()
-                    file_ext = file_path.suffix.lower()
                     
-                    for proj_type, indicators in type_indicators.items():
-                        for indicator in indicators:
-                            if indicator.startswith('.') and file_ext == indicator:
-                                detected_types.append(proj_type)
-                            elif not indicator.startswith('.') and file_name == indicator.lower():
-                                detected_types.append(proj_type)
+                    file_count += 1
+                    file_name = entry.name.lower()
+                    proj_type = EXT_TO_PROJECT_TYPE.get(os.path.splitext(file_name)[1])
+                    if proj_type:
+                        detected_types.add(proj_type)
+                    proj_type = NAME_TO_PROJECT_TYPE.get(file_name)
+                    if proj_type:
+                        detected_types.add(proj_type)
         
-        except Exception:
-            pass
-        
-        return list(set(detected_types)) if detected_types else ['unknown']
+        return {
+            'size': round(total_size / (1024 * 1024), 2),  # Convert to MB
+            'file_count': file_count,
+            'project_type': list(detected_types) if detected_types else ['unknown']
+        }
     
     def _find_libraries(self, path):
         """Find libraries and dependencies in the project"""
         libraries = []
         
         try:
+            # Parsers are cached on (path, mtime, size); missing files give []
             # Python requirements
             req_files = ['requirements.txt', 'Pipfile', 'pyproject.toml']
             for req_file in req_files:
-                req_path = path / req_file
-                if req_path.exists():
-                    libraries.extend(self._parse_python_requirements(req_path))
+                libraries.extend(self._parse_python_requirements(path / req_file))
             
             # Node.js package.json
-            package_json = path / 'package.json'
-            if package_json.exists():
-                libraries.extend(self._parse_package_json(package_json))
+            libraries.extend(self._parse_package_json(path / 'package.json'))
             
             # Go modules
-            go_mod = path / 'go.mod'
-            if go_mod.exists():
-                libraries.extend(self._parse_go_mod(go_mod))
+            libraries.extend(self._parse_go_mod(path / 'go.mod'))
             
             # Rust Cargo.toml
-            cargo_toml = path / 'Cargo.toml'
-            if cargo_toml.exists():
-                libraries.extend(self._parse_cargo_toml(cargo_toml))
+            libraries.extend(self._parse_cargo_toml(path / 'Cargo.toml'))
         
         except Exception:
             pass
         
         return list(set(libraries))
     
+    @_mtime_cache
     def _parse_python_requirements(self, file_path):
         """Parse Python requirements file"""
         libraries = []
         try:
             if file_path.name == 'requirements.txt':
-                with open(file_path, 'r') as f:
-                    for line in f:
-                        line = line.strip()
-                        if line and not line.startswith('#'):
-                            lib_name = line.split('==')[0].split('>=')[0].split('<=')[0].split('>')[0].split('<')[0]
-                            libraries.append(lib_name)
+                data = file_path.read_bytes()
+                libraries = [name.decode('ascii') for name in REQUIREMENT_NAME_RE.findall(data)]
             # Add parsing for other Python dependency files as needed
         except Exception:
             pass
         return libraries
     
+    @_mtime_cache
     def _parse_package_json(self, file_path):
         """Parse Node.js package.json"""
         libraries = []
         try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-                if 'dependencies' in data:
-                    libraries.extend(data['dependencies'].keys())
-                if 'devDependencies' in data:
-                    libraries.extend(data['devDependencies'].keys())
+            data = orjson.loads(file_path.read_bytes())
+            if 'dependencies' in data:
+                libraries.extend(data['dependencies'].keys())
+            if 'devDependencies' in data:
+                libraries.extend(data['devDependencies'].keys())
         except Exception:
             pass
         return libraries
     
+    @_mtime_cache
     def _parse_go_mod(self, file_path):
         """Parse Go go.mod file"""
         libraries = []
         try:
-            with open(file_path, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line.startswith('require'):
-                        # Simple parsing - can be improved
-                        parts = line.split()
-                        if len(parts) >= 2:
-                            libraries.append(parts[1])
+            data = file_path.read_bytes()
+            libraries = [path.decode('utf-8', 'ignore') for path in GO_REQUIRE_RE.findall(data)]
         except Exception:
             pass
         return libraries
     
+    @_mtime_cache
     def _parse_cargo_toml(self, file_path):
         """Parse Rust Cargo.toml file"""
         libraries = []
         try:
-            import toml
-            with open(file_path, 'r') as f:
-                data = toml.load(f)
-                if 'dependencies' in data:
-                    libraries.extend(data['dependencies'].keys())
+            if tomllib:
+                with open(file_path, 'rb') as f:
+                    data = tomllib.load(f)
+            else:
+                import toml
+                with open(file_path, 'r') as f:
+                    data = toml.load(f)
+            if 'dependencies' in data:
+                libraries.extend(data['dependencies'].keys())
         except Exception:
             pass
         return libraries
@@ -596,11 +1022,17 @@ class ProjectFinder:
     def _get_git_branch(self, path):
         """Get current Git branch"""
         try:
-            result = subprocess.run(
-                ['git', 'branch', '--show-current'],
-                cwd=path, capture_output=True, text=True
-            )
-            return result.stdout.strip() if result.returncode == 0 else 'unknown'
+            git_path = path / '.git'
+            if git_path.is_file():
+                # Worktrees and submodules point at their git directory
+                pointer = git_path.read_text().strip()
+                if pointer.startswith('gitdir:'):
+                    git_path = path / pointer[len('gitdir:'):].strip()
+            # HEAD holds "ref: refs/heads/<branch>", or a commit SHA when detached
+            head = (git_path / 'HEAD').read_text().strip()
+            if head.startswith('ref: refs/heads/'):
+                return head[len('ref: refs/heads/'):]
+            return head[:7] or 'unknown'
         except Exception:
             return 'unknown'
 
@@ -612,8 +1044,35 @@ class DockerManager:
         try:
             self.client = docker.from_env()
         except Exception as e:
-            print(f"Docker client initialization failed: {e}")
+            logger.warning("Docker client initialization failed: %s", e)
             self.client = None
+        # key -> (fetched at, value); see _cached
+        self._cache = {}
+    
+    def _cached(self, key, fetch):
+        """Return fetch()'s result, reusing it for DOCKER_CACHE_TTL seconds"""
+        now = time.monotonic()
+        cached = self._cache.get(key)
+        if cached and now - cached[0] < DOCKER_CACHE_TTL:
+            return cached[1]
+        value = fetch()
+        self._cache[key] = (now, value)
+        return value
+    
+    def _images(self):
+        """All images as plain dicts (one GET /images/json)"""
+        return self._cached('images', self.client.api.images)
+    
+    def _image_tags(self):
+        """Image ID -> tags, without the '<none>:<none>' placeholder"""
+        return {
+            image['Id']: [tag for tag in image.get('RepoTags') or [] if tag != '<none>:<none>']
+            for image in self._images()
+        }
+    
+    def _containers(self):
+        """All containers as plain dicts (one GET /containers/json)"""
+        return self._cached('containers', lambda: self.client.api.containers(all=True))
     
     def get_running_containers(self):
         """Get list of running containers"""
@@ -621,17 +1080,14 @@ class DockerManager:
             return []
         
         try:
-            containers = self.client.containers.list()
-            return [{
-                'id': container.short_id,
-                'name': container.name,
-                'image': container.image.tags[0] if container.image.tags else 'unknown',
-                'status': container.status,
-                'ports': self._format_ports(container.ports),
-                'created': container.attrs['Created']
-            } for container in containers]
-        except Exception as e:
-            print(f"Error getting running containers: {e}")
+            image_tags = self._image_tags()
+            return [
+                dict(self._format_container(container, image_tags),
+                     ports=self._format_ports(container.get('Ports')))
+                for container in self._containers() if container['State'] == 'running'
+            ]
+        except Exception:
+            logger.exception("Error getting running containers")
             return []
     
     def get_stopped_containers(self):
@@ -640,16 +1096,13 @@ class DockerManager:
             return []
         
         try:
-            containers = self.client.containers.list(all=True, filters={'status': 'exited'})
-            return [{
-                'id': container.short_id,
-                'name': container.name,
-                'image': container.image.tags[0] if container.image.tags else 'unknown',
-                'status': container.status,
-                'created': container.attrs['Created']
-            } for container in containers]
-        except Exception as e:
-            print(f"Error getting stopped containers: {e}")
+            image_tags = self._image_tags()
+            return [
+                self._format_container(container, image_tags)
+                for container in self._containers() if container['State'] == 'exited'
+            ]
+        except Exception:
+            logger.exception("Error getting stopped containers")
             return []
     
     def get_images(self):
@@ -658,29 +1111,47 @@ class DockerManager:
             return []
         
         try:
-            images = self.client.images.list()
+            image_tags = self._image_tags()
             return [{
-                'id': image.short_id,
-                'tags': image.tags,
-                'size': round(image.attrs['Size'] / (1024 * 1024), 2),  # MB
-                'created': image.attrs['Created']
-            } for image in images]
-        except Exception as e:
-            print(f"Error getting images: {e}")
+                'id': image['Id'][:19] if image['Id'].startswith('sha256:') else image['Id'][:12],
+                'tags': image_tags[image['Id']],
+                'size': round(image['Size'] / (1024 * 1024), 2),  # MB
+                'created': self._iso_time(image['Created'])
+            } for image in self._images()]
+        except Exception:
+            logger.exception("Error getting images")
             return []
     
+    def _format_container(self, container, image_tags):
+        """Shape a low-level container listing like the dashboard expects"""
+        tags = image_tags.get(container['ImageID'])
+        return {
+            'id': container['Id'][:12],
+            'name': container['Names'][0].lstrip('/') if container['Names'] else container['Id'][:12],
+            'image': tags[0] if tags else 'unknown',
+            'status': container['State'],
+            'created': self._iso_time(container['Created'])
+        }
+    
+    def _iso_time(self, epoch):
+        """Low-level listings use epoch seconds; the dashboard parses ISO strings"""
+        return datetime.utcfromtimestamp(epoch).isoformat() + 'Z'
+    
     def _format_ports(self, ports):
         """Format container ports for display"""
         if not ports:
             return []
         
         formatted_ports = []
-        for container_port, host_configs in ports.items():
-            if host_configs:
-                for config in host_configs:
-                    formatted_ports.append(f"{config['HostPort']}:{container_port}")
+        for port in ports:
+            container_port = f"{port['PrivatePort']}/{port['Type']}"
+            if port.get('PublicPort'):
+                formatted = f"{port['PublicPort']}:{container_port}"
             else:
-                formatted_ports.append(container_port)
+                formatted = container_port
+            # IPv4 and IPv6 bindings of the same port are listed separately
+            if formatted not in formatted_ports:
+                formatted_ports.append(formatted)
         
         return formatted_ports
 
@@ -693,7 +1164,7 @@ class K3sManager:
             config.load_kube_config()
             self.v1 = client.CoreV1Api()
         except Exception as e:
-            print(f"Kubernetes client initialization failed: {e}")
+            logger.warning("Kubernetes client initialization failed: %s", e)
             self.v1 = None
     
     def get_nodes(self):
@@ -710,8 +1181,8 @@ class K3sManager:
                 'version': node.status.node_info.kubelet_version,
                 'os': node.status.node_info.os_image
             } for node in nodes.items]
-        except Exception as e:
-            print(f"Error getting nodes: {e}")
+        except Exception:
+            logger.exception("Error getting nodes")
             return []
     
     def get_pods(self):
@@ -720,17 +1191,28 @@ class K3sManager:
             return []
         
         try:
-            pods = self.v1.list_pod_for_all_namespaces()
-            return [{
-                'name': pod.metadata.name,
-                'namespace': pod.metadata.namespace,
-                'status': pod.status.phase,
-                'node': pod.spec.node_name,
-                'containers': len(pod.spec.containers),
-                'restarts': sum([container.restart_count or 0 for container in pod.status.container_statuses or []])
-            } for pod in pods.items if pod.status.phase == 'Running']
-        except Exception as e:
-            print(f"Error getting pods: {e}")
+            # Let the API server filter by phase, and page through large clusters
+            result = []
+            continue_token = None
+            while True:
+                pods = self.v1.list_pod_for_all_namespaces(
+                    field_selector='status.phase=Running',
+                    limit=K8S_PAGE_SIZE,
+                    _continue=continue_token
+                )
+                result.extend({
+                    'name': pod.metadata.name,
+                    'namespace': pod.metadata.namespace,
+                    'status': pod.status.phase,
+                    'node': pod.spec.node_name,
+                    'containers': len(pod.spec.containers),
+                    'restarts': sum(container.restart_count or 0 for container in pod.status.container_statuses or [])
+                } for pod in pods.items)
+                continue_token = pods.metadata._continue
+                if not continue_token:
+                    return result
+        except Exception:
+            logger.exception("Error getting pods")
             return []
     
     def _get_node_status(self, node):
@@ -762,53 +1244,51 @@ class SSHKeyManager:
         """Get list of SSH keys and their types"""
         keys = []
         
-        if not self.ssh_dir.exists():
-            return keys
-        
         try:
-            # Common SSH key patterns
-            key_patterns = ['id_*', '*_rsa', '*_dsa', '*_ecdsa', '*_ed25519']
-            
-            for pattern in key_patterns:
-                for key_file in self.ssh_dir.glob(pattern):
-                    if key_file.is_file() and not key_file.name.endswith('.pub'):
-                        key_info = self._analyze_key(key_file)
-                        if key_info:
-                            keys.append(key_info)
+            # One listing of ~/.ssh; DirEntry caches the file type and stat
+            with os.scandir(self.ssh_dir) as entries:
+                files = {entry.name: entry for entry in entries if entry.is_file()}
+        except (FileNotFoundError, NotADirectoryError):
+            return keys
+        except Exception:
+            logger.exception("Error getting SSH keys")
+            return keys
         
-        except Exception as e:
-            print(f"Error getting SSH keys: {e}")
+        for name, entry in files.items():
+            if SSH_KEY_NAME_RE.match(name) and not name.endswith('.pub'):
+                key_info = self._analyze_key(entry, name + '.pub' in files)
+                if key_info:
+                    keys.append(key_info)
         
         return keys
     
-    def _analyze_key(self, key_path):
+    def _analyze_key(self, entry, has_public):
         """Analyze SSH key file"""
+        key_path = Path(entry.path)
         try:
-            # Check if corresponding public key exists
-            pub_key_path = key_path.with_suffix(key_path.suffix + '.pub')
-            has_public = pub_key_path.exists()
-            
             # Try to determine key type
-            key_type = self._determine_key_type(key_path, pub_key_path if has_public else None)
+            pub_key_path = Path(entry.path + '.pub') if has_public else None
+            key_type = self._determine_key_type(key_path, pub_key_path)
             
+            stat = entry.stat()
             return {
-                'name': key_path.name,
-                'path': str(key_path),
+                'name': entry.name,
+                'path': entry.path,
                 'type': key_type,
                 'has_public': has_public,
-                'size': key_path.stat().st_size,
-                'modified': key_path.stat().st_mtime
+                'size': stat.st_size,
+                'modified': stat.st_mtime
             }
         
-        except Exception as e:
-            print(f"Error analyzing key {key_path}: {e}")
+        except Exception:
+            logger.exception("Error analyzing key %s", key_path)
             return None
     
     def _determine_key_type(self, private_key_path, public_key_path=None):
         """Determine SSH key type"""
         try:
             # First try to read from public key if available
-            if public_key_path and public_key_path.exists():
+            if public_key_path:
                 with open(public_key_path, 'r') as f:
                     content = f.read().strip()
                     if content.startswith('ssh-rsa'):
@@ -850,191 +1330,256 @@ def index():
     return render_template('index.html')
 
 
+def _with_agent(rows):
+    """Lazily flatten (agent_id, agent_name, items) rows into copies of the items tagged with their agent"""
+    # Copies, because the aggregates are cached and shared between requests
+    return (
+        {**item, 'agent_id': agent_id, 'agent_name': agent_name}
+        for agent_id, agent_name, items in rows
+        for item in items
+    )
+
+
+def _etag_by_data_version(view):
+    """Answer a listing view with 304 while agent data is unchanged since the client's copy"""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        # Listings only change when agent data does, so its version is the ETag
+        etag = f'{view.__name__}-{agent_manager.data_token}-{agent_manager.data_version}'
+        if etag in request.if_none_match:
+            response = Response(status=304)
+        else:
+            response = view(*args, **kwargs)
+        response.set_etag(etag)
+        response.cache_control.no_cache = True
+        return response
+    return wrapper
+
+
 @app.route('/api/projects')
+@_etag_by_data_version
 def api_projects():
     """API endpoint for aggregated projects from all agents"""
     projects_data = agent_manager.get_aggregated_projects()
     
-    # Flatten projects from all agents
-    all_projects = []
-    for agent_id, data in projects_data.items():
-        if 'projects' in data:
-            for project in data['projects']:
-                project['agent_id'] = agent_id
-                project['agent_name'] = data.get('agent_name', 'Unknown')
-                all_projects.append(project)
+    all_projects = _with_agent(
+        (agent_id, data.get('agent_name', 'Unknown'), data.get('projects', ()))
+        for agent_id, data in projects_data.items()
+    )
     
-    return jsonify(all_projects)
+    return json_stream_response(all_projects)
 
 
 @app.route('/api/docker/containers')
+@_etag_by_data_version
 def api_docker_containers():
     """API endpoint for aggregated Docker containers from all agents"""
     docker_data = agent_manager.get_aggregated_docker()
     
-    aggregated = {'running': [], 'stopped': []}
-    
-    for agent_id, data in docker_data.items():
-        if data.get('available', False) and 'containers' in data:
-            # Add agent info to each container
-            for container in data['containers'].get('running', []):
-                container['agent_id'] = agent_id
-                container['agent_name'] = data.get('agent_name', 'Unknown')
-                aggregated['running'].append(container)
-            
-            for container in data['containers'].get('stopped', []):
-                container['agent_id'] = agent_id
-                container['agent_name'] = data.get('agent_name', 'Unknown')
-                aggregated['stopped'].append(container)
-    
-    return jsonify(aggregated)
+    available = [
+        (agent_id, data.get('agent_name', 'Unknown'), data['containers'])
+        for agent_id, data in docker_data.items()
+        if data.get('available', False) and 'containers' in data
+    ]
+    aggregated = {
+        state: list(_with_agent(
+            (agent_id, agent_name, containers.get(state, ()))
+            for agent_id, agent_name, containers in available
+        ))
+        for state in ('running', 'stopped')
+    }
+    
+    return json_response(aggregated)
 
 
 @app.route('/api/docker/images')
+@_etag_by_data_version
 def api_docker_images():
     """API endpoint for aggregated Docker images from all agents"""
     docker_data = agent_manager.get_aggregated_docker()
     
-    all_images = []
-    for agent_id, data in docker_data.items():
-        if data.get('available', False) and 'images' in data:
-            for image in data['images']:
-                image['agent_id'] = agent_id
-                image['agent_name'] = data.get('agent_name', 'Unknown')
-                all_images.append(image)
+    all_images = _with_agent(
+        (agent_id, data.get('agent_name', 'Unknown'), data.get('images', ()))
+        for agent_id, data in docker_data.items()
+        if data.get('available', False)
+    )
     
-    return jsonify(all_images)
+    return json_stream_response(all_images)
 
 
 @app.route('/api/k3s/nodes')
+@_etag_by_data_version
 def api_k3s_nodes():
     """API endpoint for aggregated K3s nodes from all agents"""
     k3s_data = agent_manager.get_aggregated_k3s()
     
-    all_nodes = []
-    for agent_id, data in k3s_data.items():
-        if data.get('available', False) and 'nodes' in data:
-            for node in data['nodes']:
-                node['agent_id'] = agent_id
-                node['agent_name'] = data.get('agent_name', 'Unknown')
-                all_nodes.append(node)
+    all_nodes = _with_agent(
+        (agent_id, data.get('agent_name', 'Unknown'), data.get('nodes', ()))
+        for agent_id, data in k3s_data.items()
+        if data.get('available', False)
+    )
     
-    return jsonify(all_nodes)
+    return json_stream_response(all_nodes)
 
 
 @app.route('/api/k3s/pods')
+@_etag_by_data_version
 def api_k3s_pods():
     """API endpoint for aggregated K3s pods from all agents"""
     k3s_data = agent_manager.get_aggregated_k3s()
     
-    all_pods = []
-    for agent_id, data in k3s_data.items():
-        if data.get('available', False) and 'pods' in data:
-            for pod in data['pods']:
-                pod['agent_id'] = agent_id
-                pod['agent_name'] = data.get('agent_name', 'Unknown')
-                all_pods.append(pod)
+    all_pods = _with_agent(
+        (agent_id, data.get('agent_name', 'Unknown'), data.get('pods', ()))
+        for agent_id, data in k3s_data.items()
+        if data.get('available', False)
+    )
     
-    return jsonify(all_pods)
+    return json_stream_response(all_pods)
 
 
 @app.route('/api/ssh/keys')
+@_etag_by_data_version
 def api_ssh_keys():
     """API endpoint for aggregated SSH keys from all agents"""
     ssh_data = agent_manager.get_aggregated_ssh()
     
-    all_keys = []
-    for agent_id, data in ssh_data.items():
-        if 'ssh_keys' in data:
-            for key in data['ssh_keys']:
-                key['agent_id'] = agent_id
-                key['agent_name'] = data.get('agent_name', 'Unknown')
-                all_keys.append(key)
+    all_keys = _with_agent(
+        (agent_id, data.get('agent_name', 'Unknown'), data.get('ssh_keys', ()))
+        for agent_id, data in ssh_data.items()
+    )
     
-    return jsonify(all_keys)
+    return json_stream_response(all_keys)
 
 
 # Agent API Endpoints
+def _agent_payload():
+    """The request's JSON object if it names an agent, else None"""
+    data = request.get_json(silent=True, cache=False)
+    if isinstance(data, dict) and isinstance(data.get('agent_id'), str) and data['agent_id']:
+        return data
+    return None
+
+
 @app.route('/api/agents/register', methods=['POST'])
 def api_agent_register():
     """Register a new agent"""
     try:
-        agent_data = request.get_json()
+        agent_data = _agent_payload()
+        if agent_data is None:
+            return INVALID_BODY_RESPONSE
         if agent_manager.register_agent(agent_data):
             return jsonify({'status': 'success', 'message': 'Agent registered'})
         else:
             return jsonify({'status': 'error', 'message': 'Failed to register agent'}), 500
-    except Exception as e:
+    except (TypeError, ValueError, KeyError) as e:
         return jsonify({'status': 'error', 'message': str(e)}), 400
 
 @app.route('/api/agents/system', methods=['POST'])
 def api_agent_system():
     """Receive system data from agent"""
     try:
-        data = request.get_json()
+        data = _agent_payload()
+        if data is None:
+            return INVALID_BODY_RESPONSE
         agent_manager.store_system_data(data)
         return jsonify({'status': 'success'})
-    except Exception as e:
+    except (TypeError, ValueError, KeyError) as e:
         return jsonify({'status': 'error', 'message': str(e)}), 400
 
 @app.route('/api/agents/projects', methods=['POST'])
 def api_agent_projects():
     """Receive projects data from agent"""
     try:
-        data = request.get_json()
+        data = _agent_payload()
+        if data is None:
+            return INVALID_BODY_RESPONSE
         agent_manager.store_projects_data(data)
         return jsonify({'status': 'success'})
-    except Exception as e:
+    except (TypeError, ValueError, KeyError) as e:
         return jsonify({'status': 'error', 'message': str(e)}), 400
 
 @app.route('/api/agents/docker', methods=['POST'])
 def api_agent_docker():
     """Receive Docker data from agent"""
     try:
-        data = request.get_json()
+        data = _agent_payload()
+        if data is None:
+            return INVALID_BODY_RESPONSE
         agent_manager.store_docker_data(data)
         return jsonify({'status': 'success'})
-    except Exception as e:
+    except (TypeError, ValueError, KeyError) as e:
         return jsonify({'status': 'error', 'message': str(e)}), 400
 
 @app.route('/api/agents/k3s', methods=['POST'])
 def api_agent_k3s():
     """Receive K3s data from agent"""
     try:
-        data = request.get_json()
+        data = _agent_payload()
+        if data is None:
+            return INVALID_BODY_RESPONSE
         agent_manager.store_k3s_data(data)
         return jsonify({'status': 'success'})
-    except Exception as e:
+    except (TypeError, ValueError, KeyError) as e:
         return jsonify({'status': 'error', 'message': str(e)}), 400
 
 @app.route('/api/agents/ssh', methods=['POST'])
 def api_agent_ssh():
     """Receive SSH data from agent"""
     try:
-        data = request.get_json()
+        data = _agent_payload()
+        if data is None:
+            return INVALID_BODY_RESPONSE
         agent_manager.store_ssh_data(data)
         return jsonify({'status': 'success'})
-    except Exception as e:
+    except (TypeError, ValueError, KeyError) as e:
         return jsonify({'status': 'error', 'message': str(e)}), 400
 
+@app.route('/api/agents/tick', methods=['POST'])
+def api_agent_tick():
+    """Receive all data sections from an agent in one request"""
+    try:
+        data = _agent_payload()
+        if data is None or any(
+            not isinstance(data.get(section), (dict, type(None)))
+            for section in TICK_SECTIONS
+        ):
+            return INVALID_BODY_RESPONSE
+        if not agent_manager.is_registered(data['agent_id']):
+            return jsonify({'status': 'error', 'message': 'Agent not registered'}), 404
+        agent_manager.store_tick_data(data)
+        return jsonify({'status': 'success'})
+    except (TypeError, ValueError, KeyError) as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+
+@app.route('/api/capabilities')
+def api_capabilities():
+    """Optional server features agents can use"""
+    return jsonify({'tick': True, 'gzip': True})
+
 @app.route('/api/agents')
 def api_agents_list():
     """Get list of all agents"""
-    return jsonify(agent_manager.get_agents())
+    return json_response(agent_manager.get_agents())
 
 @app.route('/api/system/info')
 def api_system_info():
     """API endpoint for aggregated system information from all agents"""
-    return jsonify(agent_manager.get_aggregated_system_info())
+    return json_response(agent_manager.get_aggregated_system_info())
 
 
 # AI Assistant API Endpoints
+
+# Keep-alive connections to the model runner, shared by all request threads
+llm_session = requests.Session()
+llm_session.mount('http://', HTTPAdapter(pool_connections=16, pool_maxsize=32))
+
+
 @app.route('/api/ai/status')
 def api_ai_status():
     """Check if LLM is available"""
     try:
         # Try to connect to the LLM service
-        response = requests.get('http://model-runner.docker.internal/health', timeout=5)
+        response = llm_session.get('http://model-runner.docker.internal/health', timeout=LLM_STATUS_TIMEOUT)
         if response.status_code == 200:
             return jsonify({'status': 'online', 'message': 'AI Assistant ready'})
         else:
@@ -1051,11 +1596,12 @@ def api_ai_status():
 def api_ai_chat():
     """Handle chat messages with AI assistant"""
     try:
-        data = request.get_json()
-        user_message = data.get('message', '')
+        data = request.get_json(silent=True)
+        user_message = data.get('message', '') if isinstance(data, dict) else None
         
-        if not user_message:
-            return jsonify({'success': False, 'error': 'No message provided'})
+        # Checked before get_agent_context() so junk input costs no aggregation
+        if not isinstance(user_message, str) or not user_message.strip():
+            return jsonify({'success': False, 'error': 'No message provided'}), 400
         
         # Get current agent data for context
         context_data = get_agent_context()
@@ -1071,7 +1617,7 @@ Answer questions about this infrastructure data only. Be helpful, concise, and s
 User Question: {user_message}"""
 
         # Send request to LLM
-        llm_response = requests.post(
+        llm_response = llm_session.post(
             'http://model-runner.docker.internal/engines/llama.cpp/v1/chat/completions',
             headers={'Content-Type': 'application/json'},
             json={
@@ -1082,7 +1628,7 @@ User Question: {user_message}"""
                 "max_tokens": 500,
                 "temperature": 0.7
             },
-            timeout=30
+            timeout=LLM_CHAT_TIMEOUT
         )
         
         if llm_response.status_code == 200:
@@ -1100,59 +1646,88 @@ User Question: {user_message}"""
         return jsonify({'success': False, 'error': f'Unexpected error: {str(e)}'})
 
 
+# Runs get_agent_context's reads side by side, each on its own pooled connection
+context_executor = ThreadPoolExecutor(max_workers=5, thread_name_prefix='context')
+
+# (data version, built at, text) of the last context get_agent_context built
+_context_cache = None
+
+
 def get_agent_context():
     """Get current agent data formatted for AI context"""
+    global _context_cache
+    # Read the version first, so a store racing the build marks the text stale
+    version = agent_manager.data_version
+    now = time.monotonic()
+    cached = _context_cache
+    if cached and cached[0] == version and now - cached[1] < CONTEXT_CACHE_TTL:
+        return cached[2]
+    
     try:
-        # Get agents
-        agents = agent_manager.get_agents()
+        # Get agents and aggregated data concurrently
+        futures = [context_executor.submit(fetch) for fetch in (
+            agent_manager.get_agents,
+            agent_manager.get_aggregated_projects,
+            agent_manager.get_aggregated_docker,
+            agent_manager.get_aggregated_k3s,
+            agent_manager.get_aggregated_ssh
+        )]
+        agents, projects_data, docker_data, k3s_data, ssh_data = [f.result() for f in futures]
         
-        # Get aggregated data
-        projects_data = agent_manager.get_aggregated_projects()
-        docker_data = agent_manager.get_aggregated_docker()
-        k3s_data = agent_manager.get_aggregated_k3s()
-        ssh_data = agent_manager.get_aggregated_ssh()
-        
-        # Format context
-        context = f"""
-AGENTS ({len(agents)} total):
-"""
+        # Collect the pieces and join once instead of growing a string
+        parts = [f"\nAGENTS ({len(agents)} total):\n"]
+        append = parts.append
         
         for agent in agents:
-            context += f"- {agent['agent_name']} ({agent['hostname']}) - Status: {agent['status']} - Platform: {agent['platform']} {agent['architecture']}\n"
-        
-        # Projects summary
-        total_projects = sum(len(data.get('projects', [])) for data in projects_data.values())
-        context += f"\nPROJECTS ({total_projects} total):\n"
+            append(f"- {agent['agent_name']} ({agent['hostname']}) - Status: {agent['status']} - Platform: {agent['platform']} {agent['architecture']}\n")
         
+        # Projects summary; the per-agent lines follow the total, so they
+        # are gathered first and the counts come from the same pass
+        agent_names = {a['agent_id']: a['agent_name'] for a in agents}
+        agent_lines = []
+        total_projects = 0
         project_types = {}
         for agent_id, data in projects_data.items():
-            agent_name = next((a['agent_name'] for a in agents if a['agent_id'] == agent_id), 'Unknown')
-            projects = data.get('projects', [])
-            context += f"- {agent_name}: {len(projects)} projects\n"
+            projects = data.get('projects', ())
+            total_projects += len(projects)
+            agent_lines.append(f"- {agent_names.get(agent_id, 'Unknown')}: {len(projects)} projects\n")
             
             for project in projects:
-                for ptype in project.get('project_type', []):
+                for ptype in project.get('project_type', ()):
                     project_types[ptype] = project_types.get(ptype, 0) + 1
         
-        context += f"Project Types: {', '.join(f'{k}({v})' for k, v in project_types.items())}\n"
+        append(f"\nPROJECTS ({total_projects} total):\n")
+        parts.extend(agent_lines)
+        append(f"Project Types: {', '.join(f'{k}({v})' for k, v in project_types.items())}\n")
         
-        # Docker summary
-        total_running = sum(len(data.get('containers', {}).get('running', [])) for data in docker_data.values() if data.get('available'))
-        total_stopped = sum(len(data.get('containers', {}).get('stopped', [])) for data in docker_data.values() if data.get('available'))
-        total_images = sum(len(data.get('images', [])) for data in docker_data.values() if data.get('available'))
+        # Docker summary, all three counts in one pass
+        total_running = total_stopped = total_images = 0
+        for data in docker_data.values():
+            if not data.get('available'):
+                continue
+            containers = data.get('containers')
+            if containers:
+                total_running += len(containers.get('running', ()))
+                total_stopped += len(containers.get('stopped', ()))
+            total_images += len(data.get('images', ()))
         
-        context += f"\nDOCKER:\n- Running containers: {total_running}\n- Stopped containers: {total_stopped}\n- Images: {total_images}\n"
+        append(f"\nDOCKER:\n- Running containers: {total_running}\n- Stopped containers: {total_stopped}\n- Images: {total_images}\n")
         
-        # K3s summary
-        total_nodes = sum(len(data.get('nodes', [])) for data in k3s_data.values() if data.get('available'))
-        total_pods = sum(len(data.get('pods', [])) for data in k3s_data.values() if data.get('available'))
+        # K3s summary, both counts in one pass
+        total_nodes = total_pods = 0
+        for data in k3s_data.values():
+            if data.get('available'):
+                total_nodes += len(data.get('nodes', ()))
+                total_pods += len(data.get('pods', ()))
         
-        context += f"\nKUBERNETES:\n- Nodes: {total_nodes}\n- Running pods: {total_pods}\n"
+        append(f"\nKUBERNETES:\n- Nodes: {total_nodes}\n- Running pods: {total_pods}\n")
         
         # SSH summary
-        total_keys = sum(len(data.get('ssh_keys', [])) for data in ssh_data.values())
-        context += f"\nSSH KEYS: {total_keys} total\n"
+        total_keys = sum(len(data.get('ssh_keys', ())) for data in ssh_data.values())
+        append(f"\nSSH KEYS: {total_keys} total\n")
         
+        context = ''.join(parts)
+        _context_cache = (version, now, context)
         return context
         
     except Exception as e:
@@ -1160,4 +1735,5 @@ AGENTS ({len(agents)} total):
 
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=8085, debug=True)
+    # Development server; the container image runs gunicorn instead
+    app.run(host='0.0.0.0', port=8085, debug=os.environ.get('FLASK_DEBUG') == '1')
@@ -0,0 +1,82 @@
+"""Tests for the DevOps agent (agent/simple-agent.py)"""
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+AGENT_PATH = Path(__file__).resolve().parent.parent / 'agent' / 'simple-agent.py'
+
+
+@pytest.fixture(scope='module')
+def agent_module():
+    """Load simple-agent.py, whose file name is not importable as a module"""
+    spec = importlib.util.spec_from_file_location('simple_agent', AGENT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def agent(agent_module):
+    return agent_module.SimpleAgent('http://localhost:8085')
+
+
+def _make_files(directory, count, size):
+    directory.mkdir(parents=True, exist_ok=True)
+    for i in range(count):
+        (directory / f'f{i}.txt').write_bytes(b'x' * size)
+
+
+def test_scan_project_sums_size_past_file_cap(agent, agent_module, tmp_path, monkeypatch):
+    """Many tiny files: hitting the file cap must not stop the size sum"""
+    monkeypatch.setattr(agent_module, 'MAX_SCAN_FILES', 50)
+    _make_files(tmp_path / 'a', 120, 10)
+    _make_files(tmp_path / 'b', 80, 10)
+
+    stats = agent._scan_project(tmp_path)
+
+    assert stats.file_count >= 50
+    assert stats.size_bytes == 200 * 10
+
+
+def test_scan_project_counts_files_past_size_cap(agent, agent_module, tmp_path, monkeypatch):
+    """A few large files: hitting the size cap must not stop the file count"""
+    monkeypatch.setattr(agent_module, 'MAX_SCAN_BYTES', 1000)
+    _make_files(tmp_path / 'big', 3, 1000)
+    _make_files(tmp_path / 'small', 40, 1)
+
+    stats = agent._scan_project(tmp_path)
+
+    assert stats.file_count == 43
+    assert stats.size_bytes > 1000
+
+
+def test_analyze_project_reports_capped_file_count(agent, agent_module, tmp_path, monkeypatch):
+    monkeypatch.setattr(agent_module, 'MAX_SCAN_FILES', 50)
+    _make_files(tmp_path, 120, 10)
+
+    project = agent._analyze_project(tmp_path)
+
+    assert project['file_count'] == 50
+    assert project['size'] == round(1200 / (1024 * 1024), 2)
+
+
+def test_session_retries_posts_on_gateway_errors(agent):
+    retries = agent.session.get_adapter('http://localhost:8085').max_retries
+
+    assert 'POST' in retries.allowed_methods
+    assert retries.is_retry('POST', 503)
+
+
+def test_find_libraries_reads_symlinked_manifest(agent, tmp_path):
+    shared = tmp_path / 'shared-requirements.txt'
+    shared.write_text('flask==2.3.3\nrequests>=2.31\n')
+    project = tmp_path / 'project'
+    project.mkdir()
+    (project / 'requirements.txt').symlink_to(shared)
+
+    stats = agent._scan_project(project)
+
+    assert 'requirements.txt' in stats.markers
+    assert agent._find_libraries(project, stats.markers) == ['flask', 'requests']
@@ -0,0 +1,114 @@
+"""Tests for the management server (app.py)"""
+
+import gzip
+import importlib
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from werkzeug.test import EnvironBuilder
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture(scope='module')
+def app_module(tmp_path_factory):
+    """Import app.py from a scratch directory, so agents.db is created there"""
+    old_cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp('server'))
+    sys.path.insert(0, str(REPO_ROOT))
+    try:
+        yield importlib.import_module('app')
+    finally:
+        sys.path.remove(str(REPO_ROOT))
+        os.chdir(old_cwd)
+
+
+@pytest.fixture
+def client(app_module):
+    return app_module.app.test_client()
+
+
+@pytest.mark.parametrize('body', [{'message': 1}, {'message': ['hi']}, {'message': '   '}, ['hi']])
+def test_ai_chat_rejects_missing_message(client, body):
+    response = client.post('/api/ai/chat', json=body)
+
+    assert response.status_code == 400
+    assert response.get_json() == {'success': False, 'error': 'No message provided'}
+
+
+def _register(client, agent_id):
+    response = client.post('/api/agents/register', json={
+        'agent_id': agent_id,
+        'agent_name': agent_id,
+        'hostname': 'host',
+        'platform': 'Linux',
+        'architecture': 'x86_64',
+        'python_version': '3.11',
+        'registered_at': '2024-01-01T00:00:00',
+        'capabilities': {}
+    })
+    assert response.status_code == 200
+
+
+def test_tick_sections_are_stored_for_the_ticking_agent(client, app_module):
+    _register(client, 'tick-agent')
+
+    response = client.post('/api/agents/tick', json={
+        'agent_id': 'tick-agent',
+        'system': {'agent_id': 'someone-else', 'cpu_percent': 5}
+    })
+
+    assert response.status_code == 200
+    stored = app_module.agent_manager.get_aggregated_system_info()
+    by_agent = {entry['agent']['agent_id']: entry['system'] for entry in stored}
+    assert by_agent['tick-agent']['cpu_percent'] == 5
+    assert 'someone-else' not in app_module.agent_manager.data_store.get_all_agent_data('system_data')
+
+
+def _post_gzip(client, body, **headers):
+    return client.post('/api/agents/system', data=body, headers={
+        'Content-Type': 'application/json',
+        'Content-Encoding': 'gzip',
+        **headers
+    })
+
+
+def test_gzip_upload_is_inflated(client):
+    _register(client, 'gzip-agent')
+
+    response = _post_gzip(client, gzip.compress(b'{"agent_id": "gzip-agent", "cpu_percent": 1}'))
+
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize('body', [
+    gzip.compress(b'{"agent_id": "gzip-agent"}')[:-8],
+    b'not gzip at all'
+])
+def test_gzip_upload_rejects_truncated_or_corrupt_body(client, body):
+    response = _post_gzip(client, body)
+
+    assert response.status_code == 400
+    assert response.get_json()['status'] == 'error'
+
+
+def test_gzip_upload_rejects_malformed_content_length(app_module):
+    environ = EnvironBuilder(method='POST', path='/api/agents/system', data=gzip.compress(b'{}'),
+                             headers={'Content-Encoding': 'gzip'}).get_environ()
+    environ['CONTENT_LENGTH'] = 'abc'
+    statuses = []
+    app_module.app.wsgi_app(environ, lambda status, headers: statuses.append(status))
+
+    assert statuses == ['400 BAD REQUEST']
+
+
+@pytest.mark.parametrize('directory, proj_type', [('node_modules', 'javascript'), ('.gradle', 'java')])
+def test_scan_project_detects_indicator_directories(app_module, tmp_path, directory, proj_type):
+    (tmp_path / directory).mkdir()
+    (tmp_path / directory / 'README').write_text('x')
+
+    stats = app_module.project_finder._scan_project(tmp_path)
+
+    assert stats['project_type'] == [proj_type]